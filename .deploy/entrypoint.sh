@@ -31,6 +31,11 @@ echo "Collecting static files"
 python manage.py collectstatic --no-input
 echo "Successfully collected static files"
 
+# Generating the OpenAPI schema for this code version
+echo "Caching OpenAPI schema"
+python manage.py cache_schema
+echo "Successfully cached OpenAPI schema"
+
 # Compile translation messages
 echo "Compiling translation messages"
 django-admin compilemessages
@@ -38,4 +43,4 @@ echo "Successfully compiled messages"
 
 # Starting server
 echo "Starting server"
-gunicorn core.wsgi:application --bind 0.0.0.0:8000
+gunicorn --config core/gunicorn.conf.py core.wsgi:application
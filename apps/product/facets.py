@@ -0,0 +1,256 @@
+from decimal import Decimal
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+
+from .models import ProductVariant
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from .models import Product
+
+FACETS: tuple[str, ...] = "category", "colors", "sizes", "price"
+OPERATORS: tuple[str, str] = "or", "and"
+
+
+def price_bucket(price: Decimal, bounds: tuple[int, ...]) -> str:
+    for lower, upper in zip(bounds, bounds[1:]):
+        if price < upper:
+            return f"{lower}-{upper}"
+    return f"{bounds[-1]}+"
+
+
+def price_buckets(bounds: tuple[int, ...]) -> dict[str, tuple[Decimal | None, Decimal | None]]:
+    """
+    label -> (lower, upper) price range of every bucket. The first bucket has no lower bound, since
+    price_bucket puts prices below bounds[0] in it as well.
+    """
+    buckets: dict[str, tuple[Decimal | None, Decimal | None]] = {
+        f"{lower}-{upper}": (Decimal(lower), Decimal(upper)) for lower, upper in zip(bounds, bounds[1:])
+    }
+    buckets[f"{bounds[-1]}+"] = Decimal(bounds[-1]), None
+    first: str = next(iter(buckets))
+    buckets[first] = None, buckets[first][1]
+    return buckets
+
+
+def parse_selection(params: dict[str, str]) -> tuple[dict[str, list[str]], dict[str, str]]:
+    """ Read "?colors=red,blue&colors_op=and&price=0-50" style query params. """
+    selected: dict[str, list[str]] = {
+        facet: [value.strip().lower() for value in params.get(facet, "").split(",") if value.strip()]
+        for facet in FACETS
+    }
+    operators: dict[str, str] = {
+        facet: params[f"{facet}_op"] for facet in ("colors", "sizes") if params.get(f"{facet}_op") in OPERATORS
+    }
+    return selected, operators
+
+
+class FacetIndex:
+    """
+    Bitmap index over a set of products. Every product gets an ordinal and every facet value a bitmap
+    (a Python int) with the bits of the products that have it, so counting all facets for any
+    combination of selected values is a handful of AND/OR operations and popcounts.
+    """
+
+    def __init__(self, size: int, bitmaps: dict[str, dict[str, int]],
+                 variants: dict[tuple[str, str, bool], int] | None = None) -> None:
+        self.size: int = size
+        self.bitmaps: dict[str, dict[str, int]] = bitmaps
+        self.variants: dict[tuple[str, str, bool], int] = variants or {}
+        self.all: int = (1 << size) - 1
+
+    @classmethod
+    def from_rows(cls, products: Iterable[tuple[Any, Any, Decimal]],
+                  variants: Iterable[tuple[Any, str | None, str | None, int]],
+                  price_bounds: tuple[int, ...]) -> "FacetIndex":
+        """
+        products: (id, category_id, price) rows; variants: (product_id, color, size, quantity) rows. Besides
+        the colors/sizes facets, every (color, size, in stock) combination gets a bitmap, so the variant
+        filters can be matched against a single variant. Bits are set in bytearrays and converted to ints
+        once, since OR-ing into a growing int is quadratic.
+        """
+        ordinals: dict[Any, int] = {}
+        buffers: dict[str, dict[Any, bytearray]] = {facet: {} for facet in (*FACETS, "variants")}
+
+        def set_bit(facet: str, value: Any, ordinal: int) -> None:
+            buffer: bytearray | None = buffers[facet].get(value)
+            if buffer is None:
+                buffer = buffers[facet][value] = bytearray(len(ordinals) // 8 + 1)
+            elif ordinal >> 3 >= len(buffer):
+                buffer.extend(bytes((ordinal >> 3) - len(buffer) + 1))
+            buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+
+        for pk, category_id, price in products:
+            ordinal: int = ordinals.setdefault(pk, len(ordinals))
+            set_bit(facet="category", value=str(category_id), ordinal=ordinal)
+            set_bit(facet="price", value=price_bucket(price=price, bounds=price_bounds), ordinal=ordinal)
+
+        for pk, color, size, quantity in variants:
+            ordinal: int | None = ordinals.get(pk)
+            if ordinal is None:
+                continue
+            color, size = (color or "").lower(), (size or "").lower()
+            if color:
+                set_bit(facet="colors", value=color, ordinal=ordinal)
+            if size:
+                set_bit(facet="sizes", value=size, ordinal=ordinal)
+            set_bit(facet="variants", value=(color, size, quantity > 0), ordinal=ordinal)
+
+        bitmaps: dict[str, dict[Any, int]] = {
+            facet: {value: int.from_bytes(buffer, byteorder="little") for value, buffer in values.items()}
+            for facet, values in buffers.items()
+        }
+        return cls(size=len(ordinals), variants=bitmaps.pop("variants"), bitmaps=bitmaps)
+
+    @classmethod
+    def from_queryset(cls, queryset: "QuerySet[Product]") -> "FacetIndex":
+        scope: "QuerySet[Product]" = queryset.order_by()
+        return cls.from_rows(
+            products=scope.values_list("id", "category_id", "price").iterator(chunk_size=10000),
+            variants=ProductVariant.objects.filter(product__in=scope.values("id"))
+            .values_list("product_id", "color__name", "size__name", "quantity").iterator(chunk_size=10000),
+            price_bounds=settings.PRODUCT_PRICE_BUCKETS,
+        )
+
+    def match(self, facet: str, values: list[str], operator: str = "or") -> int:
+        bitmaps: list[int] = [self.bitmaps[facet].get(value, 0) for value in values]
+        result: int = self.all if operator == "and" else 0
+        for bitmap in bitmaps:
+            result = result & bitmap if operator == "and" else result | bitmap
+        return result
+
+    def match_variant(self, color: str | None = None, size: str | None = None, in_stock: bool | None = None) -> int:
+        """ Products with a single variant matching all the given values, like ProductFilter's variant filters. """
+        color, size = color and color.lower(), size and size.lower()
+        result: int = 0
+        for (variant_color, variant_size, variant_in_stock), bitmap in self.variants.items():
+            if ((not color or color == variant_color) and (not size or size == variant_size)
+                    and (in_stock is None or in_stock == variant_in_stock)):
+                result |= bitmap
+        return result
+
+    def counts(self, selected: dict[str, list[str]] | None = None, operators: dict[str, str] | None = None,
+               variant: dict[str, str | bool | None] | None = None) -> dict[str, dict[str, int]]:
+        """
+        Facet counts for the selected values. Values inside a facet are OR-ed (or AND-ed when its operator is
+        "and"); facets are AND-ed with each other. An OR facet is counted without its own selection, so the
+        other values of that facet keep showing how many products they would add. The variant filters
+        (color, size, in_stock) narrow every facet.
+        """
+        selected = {facet: values for facet, values in (selected or {}).items() if values}
+        operators = operators or {}
+        matches: dict[str, int] = {
+            facet: self.match(facet=facet, values=values, operator=operators.get(facet, "or"))
+            for facet, values in selected.items()
+        }
+
+        scope: int = self.all
+        if variant and any(value not in (None, "") for value in variant.values()):
+            scope = self.match_variant(**variant)
+
+        counts: dict[str, dict[str, int]] = {}
+        for facet in FACETS:
+            base: int = scope
+            for other, bitmap in matches.items():
+                if other != facet or operators.get(facet, "or") == "and":
+                    base &= bitmap
+            counts[facet] = {
+                value: count for value, bitmap in sorted(self.bitmaps[facet].items())
+                if (count := (base & bitmap).bit_count())
+            }
+
+        return counts
+
+
+class FacetService:
+    VERSION_KEY: str = "product:facets:version"
+    _local: dict[str, tuple[FacetIndex, float]] = {}
+
+    @classmethod
+    def get_category_key(cls, category_id: Any) -> str:
+        return f"category:{category_id}"
+
+    @classmethod
+    def get_version(cls, key: str) -> str:
+        """
+        Version of the index named by key: a global part bumped by color and size renames, and a part of its
+        own bumped by changes to its products, so a save in one category leaves the other indexes alone.
+        """
+        version_keys: list[str] = [cls.VERSION_KEY, f"{cls.VERSION_KEY}:{key}"]
+        versions: dict[str, int] = cache.get_many(version_keys)
+        for version_key in version_keys:
+            if version_key not in versions:
+                # Start from the clock rather than 1, so indexes cached under an evicted version are never reused.
+                cache.add(version_key, int(time()), timeout=None)
+                versions[version_key] = cache.get(version_key)
+        return ".".join(str(versions[version_key]) for version_key in version_keys)
+
+    @classmethod
+    def invalidate(cls, keys: Iterable[str] | None = None) -> None:
+        """ Bumps the version of the indexes named by keys, or of every index when no keys are given. """
+        version_keys: set[str] = {cls.VERSION_KEY} if keys is None else {f"{cls.VERSION_KEY}:{key}" for key in keys}
+        for version_key in version_keys:
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                cache.add(version_key, int(time()), timeout=None)
+
+    @classmethod
+    def filter_queryset(cls, queryset: "QuerySet[Product]", selected: dict[str, list[str]],
+                        operators: dict[str, str]) -> "QuerySet[Product]":
+        """ The same selection as FacetIndex.counts, applied to a queryset for the result page. """
+        if selected.get("category"):
+            queryset = queryset.filter(category_id__in=selected["category"])
+
+        for facet, lookup in (("colors", "color__name__iexact"), ("sizes", "size__name__iexact")):
+            if not selected.get(facet):
+                continue
+            variants = ProductVariant.objects.filter(product=OuterRef("pk"))
+            if operators.get(facet) == "and":
+                for value in selected[facet]:
+                    queryset = queryset.filter(Exists(variants.filter(**{lookup: value})))
+            else:
+                condition: Q = Q()
+                for value in selected[facet]:
+                    condition |= Q(**{lookup: value})
+                queryset = queryset.filter(Exists(variants.filter(condition)))
+
+        if selected.get("price"):
+            buckets: dict[str, tuple[Decimal | None, Decimal | None]] = price_buckets(settings.PRODUCT_PRICE_BUCKETS)
+            condition: Q = Q(pk__in=[])
+            for lower, upper in filter(None, map(buckets.get, selected["price"])):
+                bucket: Q = Q()
+                if lower is not None:
+                    bucket &= Q(price__gte=lower)
+                if upper is not None:
+                    bucket &= Q(price__lt=upper)
+                condition |= bucket
+            queryset = queryset.filter(condition)
+
+        return queryset
+
+    @classmethod
+    def get_index(cls, key: str, queryset: "QuerySet[Product]") -> FacetIndex:
+        """
+        Index for the product scope named by key. It is shared through the cache and kept per process for
+        PRODUCT_FACET_LOCAL_TIMEOUT seconds, and rebuilt only after a change has bumped its version.
+        """
+        cache_key: str = f"product:facets:{key}:{cls.get_version(key=key)}"
+        entry: tuple[FacetIndex, float] | None = cls._local.get(cache_key)
+        if entry is not None and entry[1] > monotonic():
+            return entry[0]
+
+        index: FacetIndex | None = cache.get(cache_key)
+        if index is None:
+            index = FacetIndex.from_queryset(queryset=queryset)
+            cache.set(cache_key, index, timeout=settings.PRODUCT_FACET_INDEX_TIMEOUT)
+
+        if len(cls._local) >= settings.PRODUCT_FACET_LOCAL_INDEXES:
+            cls._local.clear()
+        cls._local[cache_key] = index, monotonic() + settings.PRODUCT_FACET_LOCAL_TIMEOUT
+        return index
@@ -1,14 +1,34 @@
 from typing import Type, TYPE_CHECKING
+from uuid import UUID
 
-from django.db.models import Q
-from django_filters import FilterSet, CharFilter
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q, Exists, OuterRef
+from django_filters import FilterSet, CharFilter, BooleanFilter, ChoiceFilter
 
-from .models import Category
+from .facets import FacetService, parse_selection, price_buckets
+from .models import Category, Product, ProductVariant
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
 
+def validate_uuid_list(value: str) -> None:
+    for item in filter(None, map(str.strip, value.split(","))):
+        try:
+            UUID(item)
+        except ValueError:
+            raise ValidationError(f"'{item}' is not a valid UUID.")
+
+
+def validate_price_buckets(value: str) -> None:
+    # only whole buckets, so the result page always matches one of the price facet counts
+    buckets: dict[str, tuple] = price_buckets(settings.PRODUCT_PRICE_BUCKETS)
+    for item in filter(None, map(str.strip, value.split(","))):
+        if item.lower() not in buckets:
+            raise ValidationError(f"'{item}' is not a price bucket, choose from {', '.join(buckets)}.")
+
+
 class CategoryFilter(FilterSet):
     class Meta:
         model: Type[Category] = Category
@@ -22,3 +42,58 @@ class CategoryFilter(FilterSet):
             Q(name__icontains=value) |
             Q(parent__name__icontains=value)
         ).distinct()
+
+
+class ProductFilter(FilterSet):
+    class Meta:
+        model: Type[Product] = Product
+        fields: list[str] = ["color", "size", "in_stock", "category", "colors", "colors_op", "sizes", "sizes_op",
+                             "price"]
+
+    color = CharFilter(method="filter_variants", label="color")
+    size = CharFilter(method="filter_variants", label="size")
+    in_stock = BooleanFilter(method="filter_variants", label="in_stock")
+    category = CharFilter(method="filter_facets", label="category ids, comma separated",
+                          validators=[validate_uuid_list])
+    colors = CharFilter(method="filter_facets", label="colors, comma separated")
+    colors_op = ChoiceFilter(method="filter_facets", choices=[("or", "or"), ("and", "and")], label="colors_op")
+    sizes = CharFilter(method="filter_facets", label="sizes, comma separated")
+    sizes_op = ChoiceFilter(method="filter_facets", choices=[("or", "or"), ("and", "and")], label="sizes_op")
+    price = CharFilter(method="filter_facets", label="price buckets, comma separated",
+                       validators=[validate_price_buckets])
+
+    @staticmethod
+    def filter_variants(queryset: "QuerySet[Product]", name: str, value: str | bool) -> "QuerySet[Product]":
+        # Variant filters are combined into one EXISTS in filter_queryset, so that "red, M, in stock"
+        # has to match a single variant instead of three different ones.
+        return queryset
+
+    @staticmethod
+    def filter_facets(queryset: "QuerySet[Product]", name: str, value: str) -> "QuerySet[Product]":
+        # Facet filters depend on each other (colors with colors_op), so they are applied in filter_queryset.
+        return queryset
+
+    def get_variant_selection(self) -> dict[str, str | bool | None]:
+        """ The cleaned color, size and in_stock values, as FacetIndex.counts takes them. """
+        data: dict[str, str | bool | None] = self.form.cleaned_data
+        return {"color": data.get("color") or None, "size": data.get("size") or None, "in_stock": data.get("in_stock")}
+
+    def filter_queryset(self, queryset: "QuerySet[Product]") -> "QuerySet[Product]":
+        queryset = super().filter_queryset(queryset)
+        data: dict[str, str | bool | None] = self.form.cleaned_data
+
+        selected, operators = parse_selection(params={key: value for key, value in data.items() if value})
+        queryset = FacetService.filter_queryset(queryset=queryset, selected=selected, operators=operators)
+
+        variant: dict[str, str | bool | None] = self.get_variant_selection()
+        lookups: dict[str, str | int] = {}
+        if variant["color"]:
+            lookups["color__name__iexact"] = variant["color"]
+        if variant["size"]:
+            lookups["size__name__iexact"] = variant["size"]
+        if variant["in_stock"] is not None:
+            lookups["quantity__gt" if variant["in_stock"] else "quantity"] = 0
+
+        if not lookups:
+            return queryset
+        return queryset.filter(Exists(ProductVariant.objects.filter(product=OuterRef("pk"), **lookups)))
@@ -0,0 +1,51 @@
+import random
+from decimal import Decimal
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from product.facets import FacetIndex
+
+
+class Command(BaseCommand):
+    help: str = "Benchmark the facet bitmap index on a synthetic catalog (no database access)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--products", type=int, default=1_000_000)
+        parser.add_argument("--categories", type=int, default=50)
+        parser.add_argument("--colors", type=int, default=20)
+        parser.add_argument("--sizes", type=int, default=8)
+        parser.add_argument("--queries", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options) -> None:
+        rng: random.Random = random.Random(options["seed"])
+        count: int = options["products"]
+        colors: list[str] = [f"color{number}" for number in range(options["colors"])]
+        sizes: list[str] = [f"size{number}" for number in range(options["sizes"])]
+
+        products = [(number, rng.randrange(options["categories"]), Decimal(rng.randrange(1, 200000)) / 100)
+                    for number in range(count)]
+        variants = [(number, color, size, rng.randrange(3)) for number in range(count)
+                    for color in rng.sample(colors, k=2) for size in rng.sample(sizes, k=3)]
+
+        started: float = perf_counter()
+        index: FacetIndex = FacetIndex.from_rows(products=products, variants=variants,
+                                                 price_bounds=settings.PRODUCT_PRICE_BUCKETS)
+        built: float = perf_counter() - started
+
+        selections = [
+            ({"colors": rng.sample(colors, k=2), "sizes": rng.sample(sizes, k=1),
+              "category": [str(rng.randrange(options["categories"]))]}, {"colors": rng.choice(("or", "and"))})
+            for _ in range(options["queries"])
+        ]
+        started = perf_counter()
+        for selected, operators in selections:
+            index.counts(selected=selected, operators=operators, variant={"in_stock": True})
+        elapsed: float = perf_counter() - started
+
+        self.stdout.write(msg=self.style.SUCCESS(
+            f"{count} products: index built in {built:.2f}s, "
+            f"{options['queries']} facet queries in {elapsed:.2f}s "
+            f"({options['queries'] / elapsed:.0f} queries/s, {elapsed / options['queries'] * 1000:.2f} ms each)")
+        )
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from time import perf_counter
+from uuid import uuid4
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from product.models import Category, Image, Product
+from product.serializers import CategorySerializer, CategoryValuesSerializer, ProductSerializer, \
+    ProductValuesSerializer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+
+class Command(BaseCommand):
+    help: str = "Compare ModelSerializer and values() serializer throughput on list pages (data is rolled back)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--products", type=int, default=100, help="page size")
+        parser.add_argument("--categories", type=int, default=100, help="page size")
+        parser.add_argument("--rounds", type=int, default=20)
+
+    def measure(self, label: str, rows: int, rounds: int, serialize) -> float:
+        started: float = perf_counter()
+        for _ in range(rounds):
+            serialize()
+        elapsed: float = perf_counter() - started
+        self.stdout.write(
+            msg=f"{label:<28} {rows * rounds / elapsed:>10.0f} rows/s {elapsed / rounds * 1000:>8.2f} ms/page"
+        )
+        return elapsed
+
+    def handle(self, *args, **options) -> None:
+        context: dict[str, Request] = {"request": Request(APIRequestFactory().get("/"))}
+        rounds: int = options["rounds"]
+
+        with transaction.atomic():
+            seller = get_user_model().objects.create(id=uuid4(), email=f"{uuid4()}@benchmark.local",
+                                                     first_name="Bench", last_name="Mark", gender="male")
+            parent: Category = Category.objects.create(name="Benchmark")
+            categories: list[Category] = Category.objects.bulk_create(
+                [Category(name=f"Category {number}", parent=parent) for number in range(options["categories"] - 1)]
+            )
+            Category.objects.bulk_create([Category(name=f"Child {number}", parent=category)
+                                          for number, category in enumerate(categories) for _ in range(2)])
+            products: list[Product] = Product.objects.bulk_create([
+                Product(seller=seller, category=categories[0], title=f"Product {number}",
+                        description="Benchmark product", price=Decimal(number * 1999) / 100, quantity=number)
+                for number in range(options["products"])
+            ])
+            Image.objects.bulk_create([
+                Image(product_id=product, image=f"products/{product.id}_{position}.jpg", position=position,
+                      variants={str(width): f"products/{product.id}_{position}_{width}w.webp" for width in (320, 640)})
+                for product in products for position in range(3)
+            ])
+
+            product_queryset = Product.objects.filter(category=categories[0])
+            category_queryset = Category.objects.filter(id__in=[parent.id, *(category.id for category in categories)])
+
+            for label, rows, model_serialize, values_serialize in (
+                ("products", len(products),
+                 lambda: ProductSerializer(product_queryset.with_primary_image().with_variant_availability(),
+                                           many=True, context=context).data,
+                 lambda: ProductValuesSerializer(ProductValuesSerializer.get_values(product_queryset),
+                                                 many=True, context=context).data),
+                ("categories", len(categories) + 1,
+                 lambda: CategorySerializer(category_queryset, many=True, context=context).data,
+                 lambda: CategoryValuesSerializer(CategoryValuesSerializer.get_values(category_queryset),
+                                                  many=True, context=context).data),
+            ):
+                model: float = self.measure(f"{label} ModelSerializer", rows, rounds, model_serialize)
+                values: float = self.measure(f"{label} ValuesSerializer", rows, rounds, values_serialize)
+                self.stdout.write(msg=self.style.SUCCESS(f"{label}: {model / values:.1f}x faster"))
+
+            transaction.set_rollback(True)
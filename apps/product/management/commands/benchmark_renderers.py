@@ -0,0 +1,68 @@
+from decimal import Decimal
+from io import BytesIO
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from share.parsers import ORJSONParser
+from share.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help: str = "Benchmark the JSON renderers/parsers on a synthetic page shaped like ProductSerializer output"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--items", type=int, default=100)
+        parser.add_argument("--rounds", type=int, default=2000)
+
+    @classmethod
+    def build_page(cls, items: int) -> dict[str, Any]:
+        category: dict[str, Any] = {
+            "id": str(uuid4()), "name": "Electronics", "icon": None, "is_active": True,
+            "created_at": "2024-10-01", "parent": uuid4(),
+            "children": [{"id": str(uuid4()), "name": f"Child {number}", "icon": None, "is_active": True,
+                          "created_at": "2024-10-01", "parent": uuid4(), "children": []} for number in range(3)],
+        }
+        results: list[dict[str, Any]] = [{
+            "id": str(uuid4()),
+            "category": category,
+            "seller": {"id": uuid4(), "first_name": "Ali", "last_name": "Valiyev",
+                       "phone_number": "+998901234567", "email": "seller@example.com", "gender": "male"},
+            "title": f"Product {number}",
+            "description": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3,
+            "price": str(Decimal(number * 1999) / 100),
+            "image": f"/media/products/{uuid4()}.jpg",
+            "image_srcset": {f"{width}w": f"/media/products/{uuid4()}_{width}w.webp" for width in (320, 640, 1280)},
+            "quantity": number,
+            "available_variants": number % 5,
+        } for number in range(items)]
+        return {"count": items * 10, "next": "/api/products/?limit=100&offset=100", "previous": None,
+                "results": results}
+
+    def measure(self, label: str, rounds: int, function, *args) -> float:
+        started: float = perf_counter()
+        for _ in range(rounds):
+            function(*args)
+        elapsed: float = perf_counter() - started
+        self.stdout.write(msg=f"{label:<24} {rounds / elapsed:>10.0f} pages/s {elapsed / rounds * 1000:>8.3f} ms/page")
+        return elapsed
+
+    def handle(self, *args, **options) -> None:
+        page: dict[str, Any] = self.build_page(items=options["items"])
+        rounds: int = options["rounds"]
+        body: bytes = JSONRenderer().render(page)
+        if ORJSONRenderer().render(page) != body:
+            self.stderr.write(msg=self.style.WARNING("Renderer outputs differ"))
+
+        self.stdout.write(msg=f"{options['items']} items, {len(body)} bytes per page")
+        stdlib: float = self.measure("render JSONRenderer", rounds, JSONRenderer().render, page)
+        fast: float = self.measure("render ORJSONRenderer", rounds, ORJSONRenderer().render, page)
+        parse_stdlib: float = self.measure("parse JSONParser", rounds, lambda: JSONParser().parse(BytesIO(body)))
+        parse_fast: float = self.measure("parse ORJSONParser", rounds, lambda: ORJSONParser().parse(BytesIO(body)))
+
+        self.stdout.write(msg=self.style.SUCCESS(
+            f"render {stdlib / fast:.1f}x faster, parse {parse_stdlib / parse_fast:.1f}x faster")
+        )
@@ -0,0 +1,75 @@
+import sys
+from contextlib import nullcontext
+from itertools import islice
+from time import perf_counter
+from typing import Any, Iterator
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from product.models import Product
+from product.services import ProductExportService
+
+
+class Command(BaseCommand):
+    help: str = "Export the product catalog to CSV, JSONL or Parquet with constant memory"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Output file, or - for stdout (csv/jsonl only)")
+        parser.add_argument("--format", choices=ProductExportService.FORMATS + ("parquet",), default="csv",
+                            help="Output format; parquet requires pyarrow")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip")
+        parser.add_argument("--category", help="Only export products of this category id")
+        parser.add_argument("--seller", help="Only export products of this seller id")
+
+    def handle(self, *args, **options) -> None:
+        queryset = Product.objects.all()
+        if options["category"]:
+            queryset = queryset.filter(category=options["category"])
+        if options["seller"]:
+            queryset = queryset.filter(seller=options["seller"])
+
+        self.exported: int = 0
+        rows: Iterator[dict[str, Any]] = self.count(
+            rows=ProductExportService.iter_rows(queryset=queryset, chunk_size=options["chunk_size"])
+        )
+
+        started: float = perf_counter()
+        if options["format"] == "parquet":
+            if options["path"] == "-":
+                raise CommandError("Parquet output needs a file path.")
+            self.write_parquet(rows=rows, path=options["path"], chunk_size=options["chunk_size"])
+        else:
+            output = nullcontext(sys.stdout.buffer) if options["path"] == "-" else open(options["path"], "wb")
+            with output as file:
+                for line in ProductExportService.iter_lines(rows=rows, file_format=options["format"]):
+                    file.write(line.encode())
+        elapsed: float = perf_counter() - started
+
+        self.stderr.write(msg=self.style.SUCCESS(
+            f"Exported {self.exported} products in {elapsed:.2f}s "
+            f"({self.exported / elapsed if elapsed else 0:.0f} rows/s)")
+        )
+
+    def count(self, rows: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for row in rows:
+            self.exported += 1
+            yield row
+
+    @staticmethod
+    def write_parquet(rows: Iterator[dict[str, Any]], path: str, chunk_size: int) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise CommandError("Parquet export requires pyarrow: pip install pyarrow")
+
+        string, date = pyarrow.string(), pyarrow.date32()
+        schema: pyarrow.Schema = pyarrow.schema([
+            ("id", string), ("title", string), ("description", string), ("price", pyarrow.decimal128(10, 2)),
+            ("quantity", pyarrow.int64()), ("category_id", string), ("category", string), ("seller_id", string),
+            ("seller_first_name", string), ("seller_last_name", string), ("seller_email", string),
+            ("created_at", date), ("updated_at", date),
+        ])
+
+        with pyarrow.parquet.ParquetWriter(where=path, schema=schema) as writer:
+            while batch := list(islice(rows, chunk_size)):
+                writer.write_batch(pyarrow.RecordBatch.from_pylist(batch, schema=schema))
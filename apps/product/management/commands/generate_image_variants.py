@@ -0,0 +1,37 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandParser
+from product.models import Image
+from product.services import ImageService
+
+
+class Command(BaseCommand):
+    help: str = "Generate WebP variants for product images in batches and report the throughput"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=100, help="Images read per batch")
+        parser.add_argument("--workers", type=int, default=None, help="Encoder processes (default: CPU count)")
+        parser.add_argument("--all", action="store_true", help="Regenerate images that already have variants")
+
+    def handle(self, *args, **options) -> None:
+        queryset = Image.objects.exclude(image__isnull=True).exclude(image="").order_by("id")
+        if not options["all"]:
+            queryset = queryset.filter(variants={})
+
+        batch_size: int = options["batch_size"]
+        total: int = 0
+        started: float = perf_counter()
+        batch: list[Image] = []
+        for image in queryset.iterator(chunk_size=batch_size):
+            batch.append(image)
+            if len(batch) == batch_size:
+                total += ImageService.generate_variants_batch(images=batch, workers=options["workers"])
+                batch = []
+        if batch:
+            total += ImageService.generate_variants_batch(images=batch, workers=options["workers"])
+
+        elapsed: float = perf_counter() - started
+        rate: float = total / elapsed if elapsed else 0.0
+        self.stdout.write(msg=self.style.SUCCESS(
+            f"Generated variants for {total} images in {elapsed:.2f}s ({rate:.1f} images/s)")
+        )
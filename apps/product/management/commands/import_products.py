@@ -0,0 +1,41 @@
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from product.services import ProductImportService
+from user.models import User
+
+
+class Command(BaseCommand):
+    help: str = "Import products for a seller from a CSV or JSONL file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path, help="CSV or JSONL file to import")
+        parser.add_argument("--seller", required=True, help="Email of the seller the products belong to")
+        parser.add_argument("--format", choices=ProductImportService.FORMATS, default=None,
+                            help="File format (default: detected from the extension)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows validated and inserted per batch")
+
+    def handle(self, *args, **options) -> None:
+        path: Path = options["path"]
+        file_format: str = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ProductImportService.FORMATS:
+            raise CommandError(f"Unknown import format '{file_format}', pass --format csv or --format jsonl.")
+
+        seller: User | None = User.objects.filter(email=options["seller"]).first()
+        if seller is None:
+            raise CommandError(f"Seller with email {options['seller']} not found.")
+
+        started: float = perf_counter()
+        with path.open("rb") as file:
+            result: dict[str, int | str | None] = ProductImportService.import_products(
+                stream=file, file_format=file_format, seller=seller, batch_size=options["batch_size"]
+            )
+        elapsed: float = perf_counter() - started
+
+        self.stdout.write(msg=self.style.SUCCESS(
+            f"Imported {result['created']} products in {elapsed:.2f}s "
+            f"({result['created'] / elapsed if elapsed else 0:.0f} rows/s), {result['failed']} rows failed")
+        )
+        if result["report"] is not None:
+            self.stdout.write(msg=self.style.WARNING(f"Error report: {result['report']}"))
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.14 on 2026-10-19 14:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0007_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='image',
+            options={'ordering': ['position', 'created_at']},
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='position',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='product_id',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='product.product'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['product_id', 'position'], name='product_ima_product_3dc30e_idx'),
+        ),
+    ]
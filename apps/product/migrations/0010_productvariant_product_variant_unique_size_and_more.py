@@ -0,0 +1,25 @@
+# Generated by Django 4.2.14 on 2026-10-19 15:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0009_product_variant'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='productvariant',
+            constraint=models.UniqueConstraint(condition=models.Q(('color__isnull', True), ('size__isnull', False)), fields=('product', 'size'), name='product_variant_unique_size'),
+        ),
+        migrations.AddConstraint(
+            model_name='productvariant',
+            constraint=models.UniqueConstraint(condition=models.Q(('color__isnull', False), ('size__isnull', True)), fields=('product', 'color'), name='product_variant_unique_color'),
+        ),
+        migrations.AddConstraint(
+            model_name='productvariant',
+            constraint=models.UniqueConstraint(condition=models.Q(('color__isnull', True), ('size__isnull', True)), fields=('product',), name='product_variant_unique_plain'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def combinations(product):
+    colors = [color.pk for color in product.colors.all()] or [None]
+    sizes = [size.pk for size in product.sizes.all()] or [None]
+    return [(color, size) for color in colors for size in sizes]
+
+
+def build_variants(apps, schema_editor):
+    """
+    A variant for every color/size combination of the products that have none yet, one plain variant when
+    a product has neither. Stock was kept per product, so every combination gets the product's quantity.
+    """
+    Product = apps.get_model("product", "Product")
+    ProductVariant = apps.get_model("product", "ProductVariant")
+
+    variants = []
+    products = Product.objects.filter(variants__isnull=True).prefetch_related("colors", "sizes").order_by("pk")
+    for product in products.iterator(chunk_size=BATCH_SIZE):
+        variants += [
+            ProductVariant(product=product, color_id=color, size_id=size, quantity=max(product.quantity, 0))
+            for color, size in combinations(product)
+        ]
+        if len(variants) >= BATCH_SIZE:
+            ProductVariant.objects.bulk_create(variants)
+            variants = []
+    ProductVariant.objects.bulk_create(variants)
+
+
+def remove_variants(apps, schema_editor):
+    """ Drop the variants that look like the backfill's: no sku or price, a combination, the product's stock. """
+    Product = apps.get_model("product", "Product")
+    ProductVariant = apps.get_model("product", "ProductVariant")
+
+    products = Product.objects.filter(variants__isnull=False).distinct().prefetch_related("colors", "sizes")
+    for product in products.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+        for color, size in combinations(product):
+            ProductVariant.objects.filter(product=product, color_id=color, size_id=size, sku=None, price=None,
+                                          quantity=max(product.quantity, 0)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0010_productvariant_product_variant_unique_size_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_variants, remove_variants),
+    ]
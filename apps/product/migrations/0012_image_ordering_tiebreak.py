@@ -0,0 +1,17 @@
+# Generated by Django 4.2.14 on 2026-10-19 16:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0011_backfill_product_variants'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='image',
+            options={'ordering': ['position', 'created_at', 'pk']},
+        ),
+    ]
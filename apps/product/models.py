@@ -1,7 +1,9 @@
 from uuid import uuid4
 
 from django.db.models import Model, UUIDField, CharField, TextField, DateField, ForeignKey, ManyToManyField, \
-    DecimalField, IntegerField, ImageField, BooleanField, CASCADE, OneToOneField
+    DecimalField, IntegerField, ImageField, BooleanField, CASCADE, JSONField, PositiveSmallIntegerField, Index, \
+    Prefetch, QuerySet, PositiveIntegerField, UniqueConstraint, OuterRef, Subquery, Count, Value, PROTECT, Q
+from django.db.models.functions import Coalesce
 
 
 # Create your models here.
@@ -33,7 +35,39 @@ class Size(Model):
     description = TextField(null=True)
 
 
+class ProductQuerySet(QuerySet):
+    def with_primary_image(self) -> "ProductQuerySet":
+        """ Prefetch only the first gallery image of every product, in one query. """
+        return self.prefetch_related(
+            Prefetch(lookup="images", queryset=Image.objects.all()[:1], to_attr="primary_images")
+        )
+
+    def with_primary_image_fields(self) -> "ProductQuerySet":
+        """ The first gallery image as primary_image_name/primary_image_variants columns, for values() rows. """
+        first_image = Image.objects.filter(product_id=OuterRef("pk"))
+        return self.annotate(
+            primary_image_name=Subquery(first_image.values("image")[:1]),
+            primary_image_variants=Subquery(first_image.values("variants")[:1], output_field=JSONField()),
+        )
+
+    def with_gallery(self) -> "ProductQuerySet":
+        return self.prefetch_related(Prefetch(lookup="images", queryset=Image.objects.all()))
+
+    def with_variant_availability(self) -> "ProductQuerySet":
+        """ Annotate the number of in-stock variants with a single correlated subquery. """
+        in_stock = ProductVariant.objects.filter(product=OuterRef("pk"), quantity__gt=0) \
+            .order_by().values("product").annotate(count=Count("id")).values("count")
+        return self.annotate(available_variants=Coalesce(Subquery(in_stock), Value(0)))
+
+    def with_variants(self) -> "ProductQuerySet":
+        return self.prefetch_related(
+            Prefetch(lookup="variants", queryset=ProductVariant.objects.select_related("color", "size"))
+        )
+
+
 class Product(Model):
+    objects: ProductQuerySet = ProductQuerySet.as_manager()
+
     id = UUIDField(primary_key=True, default=uuid4)
     seller = ForeignKey(to="user.User", on_delete=CASCADE)
     title = CharField(max_length=255)
@@ -46,9 +80,54 @@ class Product(Model):
     created_at = DateField(auto_now_add=True)
     updated_at = DateField(auto_now=True)
 
+    @property
+    def primary_image(self) -> "Image | None":
+        if hasattr(self, "primary_images"):
+            return self.primary_images[0] if self.primary_images else None
+        return self.images.first()
+
 
 class Image(Model):
+    class Meta:
+        # created_at is a date, so the pk breaks ties and every query agrees on which image comes first
+        ordering: list[str] = ["position", "created_at", "pk"]
+        indexes: list[Index] = [Index(fields=["product_id", "position"])]
+
     id = UUIDField(primary_key=True, default=uuid4)
-    product_id = OneToOneField(to=Product, on_delete=CASCADE, related_name="image")
+    product_id = ForeignKey(to=Product, on_delete=CASCADE, related_name="images")
     image = ImageField(null=True, max_length=255)
+    variants = JSONField(default=dict, blank=True)
+    position = PositiveSmallIntegerField(default=0)
     created_at = DateField(auto_now_add=True)
+
+
+class ProductVariant(Model):
+    """ A sellable color/size combination of a product with its own price and stock. """
+
+    class Meta:
+        ordering: list[str] = ["created_at"]
+        constraints: list[UniqueConstraint] = [
+            UniqueConstraint(fields=["product", "color", "size"], name="product_variant_unique_color_size"),
+            # NULLs are distinct in unique constraints, so variants without a color and/or size need their own
+            UniqueConstraint(fields=["product", "size"], condition=Q(color__isnull=True, size__isnull=False),
+                             name="product_variant_unique_size"),
+            UniqueConstraint(fields=["product", "color"], condition=Q(color__isnull=False, size__isnull=True),
+                             name="product_variant_unique_color"),
+            UniqueConstraint(fields=["product"], condition=Q(color__isnull=True, size__isnull=True),
+                             name="product_variant_unique_plain"),
+        ]
+        indexes: list[Index] = [Index(fields=["color", "size", "quantity"])]
+
+    id = UUIDField(primary_key=True, default=uuid4)
+    product = ForeignKey(to=Product, on_delete=CASCADE, related_name="variants")
+    color = ForeignKey(to=Color, on_delete=PROTECT, null=True, blank=True, related_name="variants")
+    size = ForeignKey(to=Size, on_delete=PROTECT, null=True, blank=True, related_name="variants")
+    sku = CharField(max_length=64, null=True, blank=True, unique=True)
+    price = DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    quantity = PositiveIntegerField(default=0)
+    created_at = DateField(auto_now_add=True)
+    updated_at = DateField(auto_now=True)
+
+    @property
+    def effective_price(self):
+        return self.product.price if self.price is None else self.price
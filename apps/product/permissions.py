@@ -10,3 +10,8 @@ if TYPE_CHECKING:
 class IsBuyer(BasePermission):
     def has_permission(self, request: "Request", view: "View") -> bool:
         return request.user.groups.filter(name="buyer").exists()
+
+
+class IsSeller(BasePermission):
+    def has_permission(self, request: "Request", view: "View") -> bool:
+        return request.user.groups.filter(name="seller").exists()
@@ -1,8 +1,17 @@
-from typing import Type
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Type
 
-from rest_framework.serializers import ModelSerializer, CharField, SerializerMethodField
+from django.core.files.storage import Storage
+from rest_framework.fields import DateField, DecimalField
+from rest_framework.serializers import ModelSerializer, SerializerMethodField, Serializer, FileField, ChoiceField, \
+    ValidationError, UUIDField, SlugRelatedField
+from share.serializers import ValuesSerializer
 
-from .models import Category, Product
+from .models import Category, Product, Image, ProductVariant
+from .services import ImageService, ProductImportService, ProductExportService
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
 
 
 class CategorySerializer(ModelSerializer):
@@ -16,14 +25,41 @@ class CategorySerializer(ModelSerializer):
         return CategorySerializer(obj.children.all(), many=True).data
 
 
+class ImageSerializer(ModelSerializer):
+    class Meta:
+        model: Type[Image] = Image
+        fields: tuple[str] = "id", "image", "image_srcset", "position"
+
+    image_srcset = SerializerMethodField(method_name="get_image_srcset")
+
+    def get_image_srcset(self, obj: Image) -> dict[str, str]:
+        return ImageService.get_srcset(image=obj)
+
+
+class ProductVariantSerializer(ModelSerializer):
+    class Meta:
+        model: Type[ProductVariant] = ProductVariant
+        fields: tuple[str] = "id", "sku", "color", "size", "price", "quantity"
+
+    color = SlugRelatedField(slug_field="name", read_only=True)
+    size = SlugRelatedField(slug_field="name", read_only=True)
+    price = SerializerMethodField(method_name="get_price")
+
+    def get_price(self, obj: ProductVariant) -> str:
+        return str(obj.effective_price)
+
+
 class ProductSerializer(ModelSerializer):
     class Meta:
         model: Type[Product] = Product
-        fields: tuple[str] = "id", "category", "seller", "title", "description", "price", "image", "quantity"
+        fields: tuple[str] = "id", "category", "seller", "title", "description", "price", "image", "image_srcset", \
+            "quantity", "available_variants"
 
     category = CategorySerializer()
     seller = SerializerMethodField(method_name="get_seller")
-    image = CharField(source="image.image.url")
+    image = SerializerMethodField(method_name="get_image")
+    image_srcset = SerializerMethodField(method_name="get_image_srcset")
+    available_variants = SerializerMethodField(method_name="get_available_variants")
 
     def get_seller(self, obj) -> dict[str, str]:
         seller = obj.seller
@@ -36,3 +72,139 @@ class ProductSerializer(ModelSerializer):
             "email": seller.email,
             "gender": seller.gender
         }
+
+    def get_image(self, obj: Product) -> str | None:
+        image: Image | None = obj.primary_image
+        if image is None or not image.image:
+            return None
+        return image.image.url
+
+    def get_image_srcset(self, obj: Product) -> dict[str, str]:
+        image: Image | None = obj.primary_image
+        if image is None:
+            return {}
+        return ImageService.get_srcset(image=image)
+
+    def get_available_variants(self, obj: Product) -> int | None:
+        return getattr(obj, "available_variants", None)
+
+
+class ProductDetailSerializer(ProductSerializer):
+    class Meta(ProductSerializer.Meta):
+        fields: tuple[str] = ProductSerializer.Meta.fields + ("images", "variants")
+
+    images = ImageSerializer(many=True, read_only=True)
+    variants = ProductVariantSerializer(many=True, read_only=True)
+
+
+class ProductImportSerializer(Serializer):
+    file = FileField(required=True)
+    format = ChoiceField(choices=ProductImportService.FORMATS, required=False)
+
+    def validate(self, attrs: dict) -> dict:
+        if "format" not in attrs:
+            extension: str = attrs["file"].name.rsplit(".", 1)[-1].lower()
+            if extension not in ProductImportService.FORMATS:
+                raise ValidationError(
+                    detail={"format": "Could not detect the file format, pass 'csv' or 'jsonl'."},
+                    code="unknown_import_format"
+                )
+            attrs["format"] = extension
+
+        return attrs
+
+
+class ProductExportSerializer(Serializer):
+    file_format = ChoiceField(choices=ProductExportService.FORMATS, default="csv")
+    category = UUIDField(required=False)
+
+
+class CategoryValuesSerializer(ValuesSerializer):
+    """ Read-only CategorySerializer over values() rows; the children of a page are loaded one level per query. """
+    fields: dict[str, str] = {
+        "id": "id", "name": "name", "icon": "icon", "is_active": "is_active", "created_at": "created_at",
+        "parent": "parent_id", "children": "id",
+    }
+    storage: Storage = Category._meta.get_field("icon").storage
+    date_field: DateField = DateField()
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        self.children: defaultdict[Any, list[dict[str, Any]]] = defaultdict(list)
+        loaded: set[Any] = set()
+        parent_ids: set[Any] = {row["id"] for row in rows}
+        while parent_ids:
+            loaded |= parent_ids
+            level: list[dict[str, Any]] = list(self.get_values(Category.objects.filter(parent_id__in=parent_ids)))
+            for child in level:
+                self.children[child["parent_id"]].append(child)
+            # page rows can be each other's descendants, their children are loaded only once
+            parent_ids = {child["id"] for child in level} - loaded
+
+    def get_id(self, row: dict[str, Any]) -> str:
+        return str(row["id"])
+
+    def get_icon(self, row: dict[str, Any], absolute: bool = True) -> str | None:
+        if not row["icon"]:
+            return None
+        url: str = self.storage.url(row["icon"])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if absolute and request is not None else url
+
+    def get_created_at(self, row: dict[str, Any]) -> str | None:
+        return self.date_field.to_representation(row["created_at"])
+
+    def get_children(self, row: dict[str, Any]) -> list[dict[str, Any]]:
+        # CategorySerializer renders children without the request, so their icon URLs stay relative
+        return [
+            dict(self.to_representation(child), icon=self.get_icon(child, absolute=False))
+            for child in self.children[row["id"]]
+        ]
+
+
+class ProductValuesSerializer(ValuesSerializer):
+    """ Read-only ProductSerializer over values() rows, see get_values() for the queryset it needs. """
+    fields: dict[str, str] = {
+        "id": "id", "category": "category_id", "seller": "seller_id", "title": "title",
+        "description": "description", "price": "price", "image": "primary_image_name",
+        "image_srcset": "primary_image_variants", "quantity": "quantity", "available_variants": "available_variants",
+    }
+    seller_fields: dict[str, str] = {
+        "id": "seller_id", "first_name": "seller__first_name", "last_name": "seller__last_name",
+        "phone_number": "seller__phone_number", "email": "seller__email", "gender": "seller__gender",
+    }
+    storage: Storage = Image._meta.get_field("image").storage
+    price_field: DecimalField = DecimalField(max_digits=Product._meta.get_field("price").max_digits,
+                                             decimal_places=Product._meta.get_field("price").decimal_places)
+
+    @classmethod
+    def get_values(cls, queryset: "QuerySet[Product]") -> "QuerySet[Product]":
+        return queryset.with_primary_image_fields().with_variant_availability() \
+            .values(*dict.fromkeys((*cls.fields.values(), *cls.seller_fields.values())))
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        serializer: CategoryValuesSerializer = CategoryValuesSerializer(context=self.context)
+        categories: list[dict[str, Any]] = list(serializer.get_values(
+            Category.objects.filter(id__in={row["category_id"] for row in rows})
+        ))
+        serializer.prepare(rows=categories)
+        self.categories: dict[Any, dict[str, Any]] = {
+            category["id"]: serializer.to_representation(category) for category in categories
+        }
+
+    def get_id(self, row: dict[str, Any]) -> str:
+        return str(row["id"])
+
+    def get_category(self, row: dict[str, Any]) -> dict[str, Any]:
+        return self.categories[row["category_id"]]
+
+    def get_seller(self, row: dict[str, Any]) -> dict[str, Any]:
+        return {name: row[lookup] for name, lookup in self.seller_fields.items()}
+
+    def get_price(self, row: dict[str, Any]) -> str:
+        return self.price_field.to_representation(row["price"])
+
+    def get_image(self, row: dict[str, Any]) -> str | None:
+        return self.storage.url(row["primary_image_name"]) if row["primary_image_name"] else None
+
+    def get_image_srcset(self, row: dict[str, Any]) -> dict[str, str]:
+        return {f"{width}w": self.storage.url(name) for width, name in (row["primary_image_variants"] or {}).items()}
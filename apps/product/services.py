@@ -0,0 +1,397 @@
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+from io import BytesIO, TextIOWrapper
+from itertools import islice
+from pathlib import PurePosixPath
+from tempfile import TemporaryFile
+from typing import TYPE_CHECKING, Any, IO, Iterable, Iterator
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .facets import FacetService
+from .models import Category, Color, Image, Product, ProductVariant, Size
+
+if TYPE_CHECKING:
+    from django.core.files.storage import Storage
+    from django.db.models import QuerySet
+    from user.models import User
+
+PRODUCT_DETAIL_CACHE_PREFIX: str = "product:detail"
+
+
+class ImageService:
+    @classmethod
+    def build_variants(cls, content: bytes, widths: Iterable[int] | None = None) -> dict[int, bytes]:
+        """
+        Encode WebP variants of an original image, one per width. Metadata (EXIF, ICC, XMP) is not
+        copied to the variants and widths larger than the original are skipped instead of upscaled.
+        Works on plain bytes so it can run inside a worker process.
+        """
+        from PIL import Image as PILImage, ImageOps
+
+        if widths is None:
+            widths = settings.PRODUCT_IMAGE_VARIANT_WIDTHS
+
+        with PILImage.open(BytesIO(content)) as original:
+            original: PILImage.Image = ImageOps.exif_transpose(original)
+            if original.mode not in ("RGB", "RGBA"):
+                original = original.convert("RGBA" if "transparency" in original.info else "RGB")
+
+            variants: dict[int, bytes] = {}
+            for width in sorted(set(widths)):
+                if width > original.width:
+                    continue
+                height: int = max(1, round(original.height * width / original.width))
+                resized: PILImage.Image = original.resize(size=(width, height), resample=PILImage.Resampling.LANCZOS)
+
+                buffer: BytesIO = BytesIO()
+                resized.save(buffer, format="WEBP", quality=settings.PRODUCT_IMAGE_VARIANT_QUALITY, method=4)
+                variants[width] = buffer.getvalue()
+
+        return variants
+
+    @classmethod
+    def get_variant_name(cls, name: str, width: int) -> str:
+        path: PurePosixPath = PurePosixPath(name)
+        return str(path.with_name(f"{path.stem}_{width}w.webp"))
+
+    @classmethod
+    def save_variants(cls, image: Image, variants: dict[int, bytes]) -> dict[str, str]:
+        storage: "Storage" = image.image.storage
+        stored: dict[str, str] = {}
+        for width, content in variants.items():
+            name: str = cls.get_variant_name(name=image.image.name, width=width)
+            if storage.exists(name):
+                storage.delete(name)
+            stored[str(width)] = storage.save(name, ContentFile(content))
+
+        image.variants = stored
+        image.save(update_fields=["variants"])
+        return stored
+
+    @classmethod
+    def read_original(cls, image: Image) -> bytes:
+        with image.image.open("rb") as file:
+            return file.read()
+
+    @classmethod
+    def generate_variants(cls, image: Image) -> dict[str, str]:
+        if not image.image:
+            return {}
+        return cls.save_variants(image=image, variants=cls.build_variants(content=cls.read_original(image=image)))
+
+    @classmethod
+    def generate_variants_batch(cls, images: Iterable[Image], workers: int | None = None) -> int:
+        """
+        Generate variants for many images, encoding them in a process pool. Storage reads and writes
+        stay in the calling process; only raw bytes cross the process boundary. Not usable inside a Celery
+        prefork worker, whose daemonic processes cannot have children; see tasks.generate_image_variants_batch.
+        """
+        images: list[Image] = [image for image in images if image.image]
+        if not images:
+            return 0
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        originals: list[bytes] = [cls.read_original(image=image) for image in images]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for image, variants in zip(images, executor.map(cls.build_variants, originals)):
+                cls.save_variants(image=image, variants=variants)
+
+        return len(images)
+
+    @classmethod
+    def get_srcset(cls, image: Image) -> dict[str, str]:
+        storage: "Storage" = image.image.storage
+        return {f"{width}w": storage.url(name) for width, name in (image.variants or {}).items()}
+
+
+class ProductImportService:
+    FORMATS: tuple[str, str] = "csv", "jsonl"
+    MAX_TITLE_LENGTH: int = Product._meta.get_field("title").max_length
+    MAX_PRICE_DIGITS: int = Product._meta.get_field("price").max_digits
+    PRICE_DECIMAL_PLACES: int = Product._meta.get_field("price").decimal_places
+    # IntegerField range that is safe on every database Django supports
+    MAX_QUANTITY: int = 2147483647
+    INVALID_ENCODING_ERROR: str = "Row is not valid UTF-8."
+    # as long as Celery keeps the task result (result_expires)
+    TASK_OWNER_TIMEOUT: int = 60 * 60 * 24
+
+    @classmethod
+    def get_task_key(cls, task_id: str) -> str:
+        return f"product:import:{task_id}"
+
+    @classmethod
+    def set_task_owner(cls, task_id: str, seller_id: Any) -> None:
+        cache.set(cls.get_task_key(task_id=task_id), str(seller_id), timeout=cls.TASK_OWNER_TIMEOUT)
+
+    @classmethod
+    def is_task_owner(cls, task_id: str, seller_id: Any) -> bool:
+        """ False for tasks of other sellers, unknown ids and tasks that are not imports. """
+        return cache.get(cls.get_task_key(task_id=task_id)) == str(seller_id)
+
+    @classmethod
+    def read_rows(cls, stream: IO[bytes], file_format: str) -> Iterator[dict[str, Any]]:
+        """
+        Yield rows one at a time; the file is never loaded into memory as a whole. Bytes that are not UTF-8
+        are decoded as U+FFFD, and the rows they end up in are reported instead of failing the whole import.
+        """
+        text: TextIOWrapper = TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+        if file_format == "csv":
+            for row in csv.DictReader(text):
+                invalid: bool = any("\ufffd" in str(value) for item in row.items() for value in item)
+                yield {"__error__": cls.INVALID_ENCODING_ERROR} if invalid else row
+            return
+
+        for line in text:
+            if not line.strip():
+                continue
+            if "\ufffd" in line:
+                yield {"__error__": cls.INVALID_ENCODING_ERROR}
+                continue
+            try:
+                row: Any = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            yield row if isinstance(row, dict) else {"__error__": "Invalid JSON object."}
+
+    @classmethod
+    def split_names(cls, value: str | list[str] | None) -> list[str]:
+        """ "Black;Red" or ["Black", "Red"]; anything else raises TypeError. """
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = value.split(";")
+        if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+            raise TypeError
+        return list(dict.fromkeys(name.strip().lower() for name in value if name.strip()))
+
+    @classmethod
+    def name_map(cls, model: type[Category] | type[Color] | type[Size]) -> dict[str, Any]:
+        return {name.strip().lower(): pk for pk, name in model.objects.values_list("id", "name")}
+
+    @classmethod
+    def parse_quantity(cls, value: Any) -> int:
+        """ Whole numbers only: "3" and 3.0 pass, 3.5, "3.5" and True are rejected instead of truncated. """
+        if value is None or value == "":
+            return 0
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError
+        quantity: int = int(value) if isinstance(value, (int, float)) else int(str(value).strip())
+        if not 0 <= quantity <= cls.MAX_QUANTITY:
+            raise ValueError
+        return quantity
+
+    @classmethod
+    def validate_row(cls, row: dict[str, Any], categories: dict[str, Any]) -> tuple[dict[str, Any], list[str]]:
+        if "__error__" in row:
+            return {}, [row["__error__"]]
+
+        errors: list[str] = []
+
+        title: Any = row.get("title") or ""
+        if not isinstance(title, str):
+            title = ""
+            errors.append("title must be a string.")
+        elif not (title := title.strip()):
+            errors.append("title is required.")
+        elif len(title) > cls.MAX_TITLE_LENGTH:
+            errors.append(f"title may not be longer than {cls.MAX_TITLE_LENGTH} characters.")
+
+        try:
+            price: Decimal | None = Decimal(str(row.get("price", "")).strip())
+            sign, digits, exponent = price.as_tuple()
+            if not price.is_finite() or price < 0 or -exponent > cls.PRICE_DECIMAL_PLACES \
+                    or len(digits) + exponent > cls.MAX_PRICE_DIGITS - cls.PRICE_DECIMAL_PLACES:
+                raise InvalidOperation
+        except (InvalidOperation, ValueError):
+            price = None
+            errors.append("price must be a non-negative number with at most 2 decimal places.")
+
+        try:
+            quantity: int | None = cls.parse_quantity(value=row.get("quantity"))
+        except (TypeError, ValueError):
+            quantity = None
+            errors.append(f"quantity must be an integer between 0 and {cls.MAX_QUANTITY}.")
+
+        description: Any = row.get("description") or None
+        if description is not None and not isinstance(description, str):
+            description = None
+            errors.append("description must be a string.")
+
+        names: dict[str, list[str]] = {}
+        for field in ("colors", "sizes"):
+            try:
+                names[field] = cls.split_names(row.get(field))
+            except TypeError:
+                names[field] = []
+                errors.append(f"{field} must be a list of names or a ';' separated string.")
+
+        category: str = str(row.get("category") or "").strip().lower()
+        category_id: Any = categories.get(category)
+        if category_id is None:
+            errors.append(f"category '{row.get('category') or ''}' does not exist.")
+
+        return {
+            "title": title,
+            "description": description,
+            "price": price,
+            "quantity": quantity,
+            "category_id": category_id,
+            "colors": names["colors"],
+            "sizes": names["sizes"],
+        }, errors
+
+    @classmethod
+    def build_variants(cls, product_variants: Iterable[tuple[Product, list[str | None], list[str | None]]],
+                       colors: dict[str, Any], sizes: dict[str, Any]) -> list[ProductVariant]:
+        """
+        A variant for every color/size combination of a product (one plain variant when it has neither). The
+        file has a single quantity per product, so every combination gets it, as migration 0011 does.
+        """
+        return [
+            ProductVariant(product=product, color_id=colors.get(color), size_id=sizes.get(size),
+                           quantity=max(product.quantity, 0))
+            for product, product_colors, product_sizes in product_variants
+            for color in product_colors for size in product_sizes
+        ]
+
+    @classmethod
+    def resolve_names(cls, model: type[Color] | type[Size], mapping: dict[str, Any], names: Iterable[str]) -> None:
+        """ Create the missing colors/sizes of a batch at once and add them to the name -> id map. """
+        missing: list[Color | Size] = [model(name=name) for name in dict.fromkeys(names) if name not in mapping]
+        for obj in model.objects.bulk_create(missing):
+            mapping[obj.name] = obj.id
+
+    @classmethod
+    def import_products(cls, stream: IO[bytes], file_format: str, seller: "User", batch_size: int = 1000,
+                        report_name: str | None = None) -> dict[str, int | str | None]:
+        categories: dict[str, Any] = cls.name_map(model=Category)
+        categories.update({str(pk): pk for pk in categories.values()})
+        colors: dict[str, Any] = cls.name_map(model=Color)
+        sizes: dict[str, Any] = cls.name_map(model=Size)
+        color_through: type = Product.colors.through
+        size_through: type = Product.sizes.through
+
+        created: int = 0
+        failed: int = 0
+        rows: Iterator[tuple[int, dict[str, Any]]] = enumerate(cls.read_rows(stream, file_format), start=1)
+
+        with TemporaryFile(mode="w+", encoding="utf-8", newline="") as report:
+            writer = csv.writer(report)
+            writer.writerow(("row", "errors"))
+
+            while batch := list(islice(rows, batch_size)):
+                products: list[Product] = []
+                product_colors: list[tuple[Any, str]] = []
+                product_sizes: list[tuple[Any, str]] = []
+                product_variants: list[tuple[Product, list[str | None], list[str | None]]] = []
+
+                for number, row in batch:
+                    data, errors = cls.validate_row(row=row, categories=categories)
+                    if errors:
+                        failed += 1
+                        writer.writerow((number, " ".join(errors)))
+                        continue
+
+                    product: Product = Product(
+                        id=uuid4(), seller=seller, title=data["title"], description=data["description"],
+                        price=data["price"], quantity=data["quantity"], category_id=data["category_id"]
+                    )
+                    products.append(product)
+                    product_colors.extend((product.id, name) for name in data["colors"])
+                    product_sizes.extend((product.id, name) for name in data["sizes"])
+                    product_variants.append((product, data["colors"] or [None], data["sizes"] or [None]))
+
+                with transaction.atomic():
+                    cls.resolve_names(model=Color, mapping=colors, names=(name for _, name in product_colors))
+                    cls.resolve_names(model=Size, mapping=sizes, names=(name for _, name in product_sizes))
+                    Product.objects.bulk_create(products, batch_size=batch_size)
+                    color_through.objects.bulk_create(
+                        [color_through(product_id=pk, color_id=colors[name]) for pk, name in product_colors],
+                        batch_size=batch_size
+                    )
+                    size_through.objects.bulk_create(
+                        [size_through(product_id=pk, size_id=sizes[name]) for pk, name in product_sizes],
+                        batch_size=batch_size
+                    )
+                    ProductVariant.objects.bulk_create(cls.build_variants(
+                        product_variants=product_variants, colors=colors, sizes=sizes
+                    ), batch_size=batch_size)
+                # bulk_create sends no signals, so the facet indexes are not invalidated by the receivers
+                FacetService.invalidate(keys={
+                    FacetService.get_category_key(category_id=product.category_id) for product in products
+                })
+                created += len(products)
+
+            report_path: str | None = None
+            if failed:
+                report.seek(0)
+                report_path = default_storage.save(report_name or f"imports/{uuid4()}_errors.csv", File(report))
+
+        return {"created": created, "failed": failed, "report": report_path}
+
+
+class EchoBuffer:
+    """ File-like object for csv.writer that hands the written line back instead of storing it. """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class ProductExportService:
+    FORMATS: tuple[str, str] = "csv", "jsonl"
+    # output column -> lookup; seller and category columns are joined in the same query
+    FIELDS: dict[str, str] = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "price": "price",
+        "quantity": "quantity",
+        "category_id": "category_id",
+        "category": "category__name",
+        "seller_id": "seller_id",
+        "seller_first_name": "seller__first_name",
+        "seller_last_name": "seller__last_name",
+        "seller_email": "seller__email",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
+    UUID_FIELDS: tuple[str, ...] = "id", "category_id", "seller_id"
+
+    @classmethod
+    def iter_rows(cls, queryset: "QuerySet[Product]", chunk_size: int = 2000) -> Iterator[dict[str, Any]]:
+        """ Iterate the catalog through a server-side cursor, chunk_size rows at a time. """
+        names: tuple[str, ...] = tuple(cls.FIELDS)
+        rows: Iterator[tuple] = queryset.order_by().values_list(*cls.FIELDS.values()).iterator(chunk_size=chunk_size)
+        for values in rows:
+            row: dict[str, Any] = dict(zip(names, values))
+            for field in cls.UUID_FIELDS:
+                row[field] = str(row[field])
+            yield row
+
+    @classmethod
+    def iter_lines(cls, rows: Iterable[dict[str, Any]], file_format: str) -> Iterator[str]:
+        if file_format == "csv":
+            writer = csv.writer(EchoBuffer())
+            yield writer.writerow(cls.FIELDS)
+            for row in rows:
+                yield writer.writerow(row.values())
+        else:
+            for row in rows:
+                yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+    @classmethod
+    def stream(cls, queryset: "QuerySet[Product]", file_format: str, chunk_size: int = 2000) -> Iterator[bytes]:
+        """ Encode the export as bytes, joining chunk_size lines per yielded block to keep writes cheap. """
+        lines: Iterator[str] = cls.iter_lines(rows=cls.iter_rows(queryset=queryset, chunk_size=chunk_size),
+                                              file_format=file_format)
+        while block := list(islice(lines, chunk_size)):
+            yield "".join(block).encode()
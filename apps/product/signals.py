@@ -0,0 +1,104 @@
+from typing import Iterable, Type
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from share.services import ResponseCacheService
+
+from .facets import FacetService
+from .models import Category, Image, Product, ProductVariant, Color, Size
+from .services import PRODUCT_DETAIL_CACHE_PREFIX
+from .tasks import generate_image_variants
+
+
+@receiver(signal=post_save, sender=Image)
+def schedule_image_variants(sender: Type[Image], instance: Image, created: bool, update_fields=None, **kwargs) -> None:
+    if not instance.image or (update_fields is not None and "image" not in update_fields):
+        return
+
+    transaction.on_commit(lambda: generate_image_variants.delay(image_id=str(instance.id)))
+
+
+def invalidate_category_facets(category_ids: Iterable) -> None:
+    keys: list[str] = [FacetService.get_category_key(category_id=pk) for pk in set(category_ids) if pk is not None]
+    if keys:
+        transaction.on_commit(lambda: FacetService.invalidate(keys=keys))
+
+
+def invalidate_product_details(pks: Iterable) -> None:
+    # after the commit, so a concurrent request cannot cache the old rows again before they are replaced
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: ResponseCacheService.invalidate(prefix=PRODUCT_DETAIL_CACHE_PREFIX, pks=pks))
+
+
+@receiver(signal=pre_save, sender=Product)
+def remember_product_category(sender: Type[Product], instance: Product, update_fields=None, **kwargs) -> None:
+    # a product moved to another category leaves the index of the old one stale as well
+    if not instance._state.adding and (update_fields is None or {"category", "category_id"} & set(update_fields)):
+        instance._saved_category_id = Product.objects.filter(pk=instance.pk).values_list(
+            "category_id", flat=True
+        ).first()
+
+
+@receiver(signal=post_save, sender=Product)
+@receiver(signal=post_delete, sender=Product)
+def invalidate_product_facets(sender: Type[Product], instance: Product, **kwargs) -> None:
+    invalidate_category_facets(category_ids=(instance.category_id, getattr(instance, "_saved_category_id", None)))
+
+
+@receiver(signal=post_save, sender=ProductVariant)
+@receiver(signal=post_delete, sender=ProductVariant)
+def invalidate_variant_facets(sender: Type[ProductVariant], instance: ProductVariant, **kwargs) -> None:
+    invalidate_category_facets(
+        category_ids=Product.objects.filter(pk=instance.product_id).values_list("category_id", flat=True)
+    )
+
+
+@receiver(signal=post_save, sender=Color)
+@receiver(signal=post_save, sender=Size)
+def invalidate_facets(sender: Type[Color] | Type[Size], instance: Color | Size, created: bool, **kwargs) -> None:
+    # a new color or size is not used by any variant yet, a renamed one can be in every index
+    if not created:
+        transaction.on_commit(FacetService.invalidate)
+
+
+@receiver(signal=post_save, sender=Product)
+@receiver(signal=post_delete, sender=Product)
+@receiver(signal=post_save, sender=Image)
+@receiver(signal=post_delete, sender=Image)
+@receiver(signal=post_save, sender=ProductVariant)
+@receiver(signal=post_delete, sender=ProductVariant)
+def invalidate_product_detail(sender: Type[Product] | Type[Image] | Type[ProductVariant],
+                              instance: Product | Image | ProductVariant, **kwargs) -> None:
+    if isinstance(instance, Product):
+        pk = instance.pk
+    elif isinstance(instance, Image):
+        pk = instance.product_id_id
+    else:
+        pk = instance.product_id
+    invalidate_product_details(pks=[pk])
+
+
+@receiver(signal=post_save, sender=Color)
+@receiver(signal=post_save, sender=Size)
+def invalidate_variant_product_details(sender: Type[Color] | Type[Size], instance: Color | Size, created: bool,
+                                       **kwargs) -> None:
+    # variants render their color and size by name
+    if not created:
+        invalidate_product_details(pks=ProductVariant.objects.filter(
+            **{sender._meta.model_name: instance}
+        ).values_list("product_id", flat=True).distinct())
+
+
+@receiver(signal=post_save, sender=Category)
+@receiver(signal=post_delete, sender=Category)
+def invalidate_category_product_details(sender: Type[Category], instance: Category, **kwargs) -> None:
+    # a product renders its category with the nested children, so every ancestor is affected as well
+    category_ids: list = [instance.pk]
+    parent_id = instance.parent_id
+    while parent_id is not None and parent_id not in category_ids:
+        category_ids.append(parent_id)
+        parent_id = Category.objects.filter(pk=parent_id).values_list("parent_id", flat=True).first()
+
+    invalidate_product_details(pks=Product.objects.filter(category_id__in=category_ids).values_list("id", flat=True))
@@ -0,0 +1,39 @@
+from uuid import UUID
+
+from celery import shared_task
+from django.core.files.storage import default_storage
+from user.models import User
+
+from .models import Image
+from .services import ImageService, ProductImportService
+
+
+@shared_task
+def generate_image_variants(image_id: UUID | str) -> int:
+    image: Image | None = Image.objects.filter(id=image_id).first()
+    if image is None:
+        return 0
+
+    return len(ImageService.generate_variants(image=image))
+
+
+@shared_task
+def generate_image_variants_batch(image_ids: list[UUID | str]) -> int:
+    # prefork pool workers are daemonic and cannot start a process pool of their own, so the batch is
+    # spread over the Celery workers instead; ImageService.generate_variants_batch is for management commands
+    for image_id in image_ids:
+        generate_image_variants.delay(image_id=str(image_id))
+    return len(image_ids)
+
+
+@shared_task
+def import_products(name: str, file_format: str, seller_id: UUID | str, batch_size: int = 1000) -> dict:
+    seller: User = User.objects.get(id=seller_id)
+    try:
+        with default_storage.open(name, "rb") as file:
+            return ProductImportService.import_products(
+                stream=file, file_format=file_format, seller=seller, batch_size=batch_size,
+                report_name=f"{name.rsplit('.', 1)[0]}_errors.csv"
+            )
+    finally:
+        default_storage.delete(name)
@@ -1,6 +1,7 @@
 from django.urls import path, include
 
-from .views import RetrieveCategoryView, ListCategoriesView, ListCategoryProductsView
+from .views import RetrieveCategoryView, ListCategoriesView, ListCategoryProductsView, RetrieveProductView, \
+    ImportProductsView, ImportProductsStatusView, ExportProductsView
 
 urlpatterns = [
     path("categories/", include(
@@ -14,5 +15,13 @@ urlpatterns = [
                 ]
             ))
         ]
-    ))
+    )),
+    path("import/", include(
+        [
+            path("", ImportProductsView.as_view()),
+            path("<str:task_id>/", ImportProductsStatusView.as_view())
+        ]
+    )),
+    path("export/", ExportProductsView.as_view()),
+    path("<uuid:pk>/", RetrieveProductView.as_view())
 ]
@@ -1,15 +1,30 @@
-from typing import TYPE_CHECKING, Type
+from typing import TYPE_CHECKING, Type, Any
+from uuid import uuid4
 
-from rest_framework.generics import RetrieveAPIView, ListAPIView
+from celery.result import AsyncResult
+from django.core.files.storage import default_storage
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import RetrieveAPIView, ListAPIView, GenericAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.status import HTTP_202_ACCEPTED
+from rest_framework.views import APIView
+from share.mixins import CachedRetrieveMixin
 
-from .filters import CategoryFilter
+from .facets import FacetService, FacetIndex, parse_selection
+from .filters import CategoryFilter, ProductFilter
 from .models import Category, Product
-from .permissions import IsBuyer
-from .serializers import CategorySerializer, ProductSerializer
+from .permissions import IsBuyer, IsSeller
+from .serializers import CategorySerializer, ProductSerializer, ProductDetailSerializer, ProductImportSerializer, \
+    ProductExportSerializer, CategoryValuesSerializer, ProductValuesSerializer
+from .services import ProductExportService, ProductImportService, PRODUCT_DETAIL_CACHE_PREFIX
+from .tasks import import_products
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
+    from rest_framework.request import Request
 
 
 # Create your views here.
@@ -20,17 +35,102 @@ class RetrieveCategoryView(RetrieveAPIView):
     permission_classes: tuple[Type[AllowAny]] = IsAuthenticated,
 
 
+@extend_schema_view(get=extend_schema(responses=CategorySerializer(many=True)))
 class ListCategoriesView(ListAPIView):
-    queryset: "QuerySet[Category]" = Category.objects.all()
-    serializer_class: Type[CategorySerializer] = CategorySerializer
+    queryset: "QuerySet[Category]" = CategoryValuesSerializer.get_values(Category.objects.all())
+    serializer_class: Type[CategoryValuesSerializer] = CategoryValuesSerializer
     permission_classes: tuple[Type[AllowAny]] = IsAuthenticated,
     filterset_class: Type[CategoryFilter] = CategoryFilter
 
 
+@extend_schema_view(get=extend_schema(responses=ProductSerializer(many=True)))
 class ListCategoryProductsView(ListAPIView):
-    serializer_class: Type[ProductSerializer] = ProductSerializer
+    serializer_class: Type[ProductValuesSerializer] = ProductValuesSerializer
     permission_classes: tuple[
         Type[AllowAny], Type[IsBuyer]] = IsAuthenticated, IsBuyer
+    filterset_class: Type[ProductFilter] = ProductFilter
 
     def get_queryset(self) -> "QuerySet[Product]":
-        return Product.objects.filter(category=self.kwargs.get("pk"))
+        return ProductValuesSerializer.get_values(Product.objects.filter(category=self.kwargs.get("pk")))
+
+    def list(self, request: "Request", *args, **kwargs) -> Response:
+        response: Response = super().list(request, *args, **kwargs)
+
+        index: FacetIndex = FacetService.get_index(
+            key=FacetService.get_category_key(category_id=self.kwargs.get("pk")),
+            queryset=Product.objects.filter(category=self.kwargs.get("pk"))
+        )
+        # already validated by the list above, which answers 400 otherwise
+        filterset: ProductFilter = self.filterset_class(data=request.query_params, request=request)
+        filterset.is_valid()
+        selected, operators = parse_selection(params=request.query_params)
+        response.data["facets"] = index.counts(selected=selected, operators=operators,
+                                               variant=filterset.get_variant_selection())
+
+        return response
+
+
+class RetrieveProductView(CachedRetrieveMixin, RetrieveAPIView):
+    cache_key_prefix: str = PRODUCT_DETAIL_CACHE_PREFIX
+    queryset: "QuerySet[Product]" = Product.objects.with_gallery().with_variants().with_variant_availability()
+    serializer_class: Type[ProductDetailSerializer] = ProductDetailSerializer
+    permission_classes: tuple[Type[AllowAny]] = IsAuthenticated,
+
+
+class ImportProductsView(GenericAPIView):
+    serializer_class: Type[ProductImportSerializer] = ProductImportSerializer
+    permission_classes: tuple[Type[IsAuthenticated], Type[IsSeller]] = IsAuthenticated, IsSeller
+
+    def post(self, request: "Request", *args, **kwargs) -> Response:
+        serializer: ProductImportSerializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        file_format: str = serializer.validated_data["format"]
+        name: str = default_storage.save(f"imports/{uuid4()}.{file_format}", serializer.validated_data["file"])
+        task: AsyncResult = import_products.delay(name=name, file_format=file_format, seller_id=str(request.user.id))
+        ProductImportService.set_task_owner(task_id=task.id, seller_id=request.user.id)
+
+        return Response(data={"task_id": task.id, "status": task.status}, status=HTTP_202_ACCEPTED)
+
+
+class ImportProductsStatusView(APIView):
+    permission_classes: tuple[Type[IsAuthenticated], Type[IsSeller]] = IsAuthenticated, IsSeller
+
+    @staticmethod
+    def get(request: "Request", task_id: str, *args, **kwargs) -> Response:
+        if not ProductImportService.is_task_owner(task_id=task_id, seller_id=request.user.id):
+            raise NotFound
+
+        result: AsyncResult = AsyncResult(id=task_id)
+        data: dict[str, Any] = {"task_id": task_id, "status": result.status}
+
+        if result.successful() and isinstance(result.result, dict):
+            data.update(result.result)
+            if data["report"] is not None:
+                data["report"] = request.build_absolute_uri(default_storage.url(data["report"]))
+
+        return Response(data=data)
+
+
+class ExportProductsView(GenericAPIView):
+    serializer_class: Type[ProductExportSerializer] = ProductExportSerializer
+    permission_classes: tuple[Type[IsAuthenticated], Type[IsSeller]] = IsAuthenticated, IsSeller
+    content_types: dict[str, str] = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+    def get(self, request: "Request", *args, **kwargs) -> StreamingHttpResponse:
+        serializer: ProductExportSerializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params: dict[str, Any] = serializer.validated_data
+
+        # sellers export their own catalog; the full feed is `manage.py export_products`
+        queryset: "QuerySet[Product]" = Product.objects.filter(seller=request.user)
+        if "category" in params:
+            queryset = queryset.filter(category=params["category"])
+
+        file_format: str = params["file_format"]
+        response: StreamingHttpResponse = StreamingHttpResponse(
+            streaming_content=ProductExportService.stream(queryset=queryset, file_format=file_format),
+            content_type=self.content_types[file_format]
+        )
+        response["Content-Disposition"] = f'attachment; filename="products.{file_format}"'
+        return response
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ShareConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'share'
+
+    def ready(self) -> None:
+        if settings.METRICS_ENABLED:
+            from . import signals  # noqa
+            from .metrics import instrument_serializers
+
+            instrument_serializers()
@@ -0,0 +1,22 @@
+from time import perf_counter
+from typing import Any
+
+from redis import Redis
+
+from .metrics import RequestMetrics, current_metrics
+
+
+class InstrumentedRedis(Redis):
+    """ Redis client that adds its command time to the sampled request, see share.middleware. """
+
+    def execute_command(self, *args, **options) -> Any:
+        metrics: RequestMetrics | None = current_metrics.get()
+        if metrics is None:
+            return super().execute_command(*args, **options)
+
+        started: float = perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            metrics.redis_time += perf_counter() - started
+            metrics.redis_commands += 1
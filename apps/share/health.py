@@ -0,0 +1,30 @@
+from typing import TYPE_CHECKING, Any
+
+from django.http import JsonResponse
+from django.utils.cache import add_never_cache_headers
+from django.views.decorators.http import require_safe
+from rest_framework.status import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
+
+from .services import HealthService
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+@require_safe
+def live(request: "HttpRequest") -> JsonResponse:
+    """ Liveness: the process serves requests. Dependencies are not checked, a restart would not fix them. """
+    response: JsonResponse = JsonResponse(data={"status": "ok"})
+    add_never_cache_headers(response)
+    return response
+
+
+@require_safe
+def ready(request: "HttpRequest") -> JsonResponse:
+    """ Readiness: 503 while the database, Redis or the Celery broker is unreachable, with per-check latency. """
+    report: dict[str, Any] = HealthService.get_report()
+    response: JsonResponse = JsonResponse(
+        data=report, status=HTTP_200_OK if report["status"] == "ok" else HTTP_503_SERVICE_UNAVAILABLE
+    )
+    add_never_cache_headers(response)
+    return response
@@ -0,0 +1,25 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandParser
+from share.services import SchemaCacheService
+from share.views import CachedSpectacularAPIView
+
+
+class Command(BaseCommand):
+    help: str = "Generate the OpenAPI schema for the current code version and store it in the cache (run on deploy)"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--force", action="store_true", help="regenerate even if the version is cached")
+
+    def handle(self, *args, **options) -> None:
+        view: CachedSpectacularAPIView = CachedSpectacularAPIView()
+        formats: dict[str, type] = {renderer.format: renderer for renderer in view.renderer_classes}
+
+        for file_format, renderer_class in formats.items():
+            started: float = perf_counter()
+            entry: dict = view.get_schema_entry(renderer=renderer_class(), version=view.api_version,
+                                                force=options["force"])
+            self.stdout.write(msg=self.style.SUCCESS(
+                f"{file_format}: {len(entry['body'])} bytes, etag {entry['etag']} "
+                f"({perf_counter() - started:.2f}s, version {SchemaCacheService.get_code_version()})"
+            ))
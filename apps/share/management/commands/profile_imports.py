@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+TARGETS: dict[str, str] = {
+    "web": "import django; django.setup(); "
+           "from django.urls import get_resolver; get_resolver().url_patterns; "
+           "import core.wsgi",
+    "celery": "from core.celery import app; app.loader.import_default_modules()",
+}
+
+
+class Command(BaseCommand):
+    help: str = "Profile the cold import of a web or celery process with `python -X importtime`"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--target", choices=TARGETS, default="web")
+        parser.add_argument("--top", type=int, default=20)
+
+    @classmethod
+    def profile(cls, target: str) -> list[tuple[str, int, int, int]]:
+        """
+        (module, nesting depth, self us, cumulative us) for every module a fresh interpreter imports for the
+        target, in the order importtime reports them. Depth 0 are the modules the target imports directly.
+        """
+        result: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", TARGETS[target]],
+            cwd=Path(settings.BASE_DIR), capture_output=True, text=True, check=True
+        )
+        modules: list[tuple[str, int, int, int]] = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or line.endswith("imported package"):
+                continue
+            own, cumulative, name = line.removeprefix("import time:").split("|")
+            modules.append((name.strip(), (len(name) - len(name.lstrip()) - 1) // 2, int(own), int(cumulative)))
+        return modules
+
+    def handle(self, *args, **options) -> None:
+        modules: list[tuple[str, int, int, int]] = self.profile(target=options["target"])
+        top: int = options["top"]
+        self.stdout.write(msg=self.style.SUCCESS(
+            f"{options['target']}: {len(modules)} modules, {sum(module[2] for module in modules) / 1000:.1f} ms"
+        ))
+
+        self.stdout.write(msg=f"\nTop {top} top-level imports by cumulative time (ms)")
+        for name, _, _, cumulative in sorted((module for module in modules if module[1] == 0),
+                                             key=lambda module: module[3], reverse=True)[:top]:
+            self.stdout.write(msg=f"{cumulative / 1000:>9.1f}  {name}")
+
+        self.stdout.write(msg=f"\nTop {top} modules by self time (ms)")
+        for name, _, own, _ in sorted(modules, key=lambda module: module[2], reverse=True)[:top]:
+            self.stdout.write(msg=f"{own / 1000:>9.1f}  {name}")
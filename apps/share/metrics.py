@@ -0,0 +1,197 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+from rest_framework.status import HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.http import HttpRequest
+
+
+class RequestMetrics:
+    """
+    Time spent in the database, Redis and serializers during one sampled request. It lives in a context
+    variable, so the hooks below find it from the request thread under WSGI as well as from the
+    sync_to_async thread that runs the view under ASGI.
+    """
+    __slots__ = ("db_time", "db_queries", "redis_time", "redis_commands", "serializer_time", "serializing")
+
+    def __init__(self) -> None:
+        self.db_time: float = 0.0
+        self.db_queries: int = 0
+        self.redis_time: float = 0.0
+        self.redis_commands: int = 0
+        self.serializer_time: float = 0.0
+        self.serializing: bool = False
+
+    def get_server_timing(self) -> list[str]:
+        return [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.db_queries} queries"',
+            f'redis;dur={self.redis_time * 1000:.2f};desc="{self.redis_commands} commands"',
+            f"serializer;dur={self.serializer_time * 1000:.2f}",
+        ]
+
+
+current_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    """ Execute wrapper installed on every database connection, see share.signals. """
+    metrics: RequestMetrics | None = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started: float = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += perf_counter() - started
+        metrics.db_queries += 1
+
+
+def install_query_recorder(connection: "BaseDatabaseWrapper") -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def time_serialization(data: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """ Wraps a serializer `data` getter; nested serializers are counted once, in the outermost one. """
+
+    @wraps(data)
+    def timed_data(serializer: Any) -> Any:
+        metrics: RequestMetrics | None = current_metrics.get()
+        if metrics is None or metrics.serializing:
+            return data(serializer)
+
+        metrics.serializing = True
+        started: float = perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            metrics.serializer_time += perf_counter() - started
+            metrics.serializing = False
+
+    timed_data.instrumented = True
+    return timed_data
+
+
+def instrument_serializers() -> None:
+    from rest_framework.serializers import BaseSerializer, ListSerializer, Serializer
+
+    for serializer_class in (BaseSerializer, Serializer, ListSerializer):
+        data: property = serializer_class.__dict__["data"]
+        if not getattr(data.fget, "instrumented", False):
+            serializer_class.data = property(time_serialization(data.fget), doc=data.__doc__)
+
+
+class MetricsRegistry:
+    """
+    Request metrics of this process in the Prometheus text format. Every request is counted and its
+    duration observed; the database/Redis/serializer totals come from sampled requests only, so divide
+    them by http_requests_sampled_total rather than by the request count. Counters are per process and
+    start from zero when a worker restarts.
+    """
+    buckets: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    breakdown: tuple[tuple[str, str, str], ...] = (
+        ("http_requests_sampled_total", "Requests with a database/Redis/serializer breakdown.", "sampled"),
+        ("http_request_db_seconds_total", "Time spent in database queries by sampled requests.", "db_time"),
+        ("http_request_db_queries_total", "Database queries run by sampled requests.", "db_queries"),
+        ("http_request_redis_seconds_total", "Time spent in Redis commands by sampled requests.", "redis_time"),
+        ("http_request_redis_commands_total", "Redis commands run by sampled requests.", "redis_commands"),
+        ("http_request_serializer_seconds_total", "Time spent in serializers by sampled requests.",
+         "serializer_time"),
+    )
+    _lock: Lock = Lock()
+    _requests: dict[tuple[str, str, str], int] = {}
+    _durations: dict[tuple[str, str], list[float]] = {}
+    _sampled: dict[str, dict[str, float]] = {}
+
+    @classmethod
+    def observe(cls, method: str, route: str, status: int, duration: float,
+                metrics: RequestMetrics | None = None) -> None:
+        with cls._lock:
+            key: tuple[str, str, str] = (method, route, str(status))
+            cls._requests[key] = cls._requests.get(key, 0) + 1
+
+            # per bucket counts followed by the sum and the count of observations
+            histogram: list[float] = cls._durations.setdefault((method, route), [0] * (len(cls.buckets) + 2))
+            histogram[bisect_left(cls.buckets, duration)] += 1
+            histogram[-2] += duration
+            histogram[-1] += 1
+
+            if metrics is not None:
+                totals: dict[str, float] = cls._sampled.setdefault(route, dict.fromkeys(
+                    (attribute for _, _, attribute in cls.breakdown), 0
+                ))
+                totals["sampled"] += 1
+                for _, _, attribute in cls.breakdown[1:]:
+                    totals[attribute] += getattr(metrics, attribute)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._requests, cls._durations, cls._sampled = {}, {}, {}
+
+    @classmethod
+    def format_labels(cls, **labels: str) -> str:
+        escaped: list[str] = []
+        for name, value in labels.items():
+            value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            escaped.append(f'{name}="{value}"')
+        return "{" + ",".join(escaped) + "}"
+
+    @classmethod
+    def render(cls) -> str:
+        lines: list[str] = []
+        with cls._lock:
+            lines += ["# HELP http_requests_total Requests by method, route and status.",
+                      "# TYPE http_requests_total counter"]
+            for (method, route, status), count in cls._requests.items():
+                lines.append(f"http_requests_total{cls.format_labels(method=method, route=route, status=status)} "
+                             f"{count}")
+
+            lines += ["# HELP http_request_duration_seconds Wall time of requests, including all middleware.",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (method, route), histogram in cls._durations.items():
+                cumulative: float = 0
+                for bound, count in zip((*map(str, cls.buckets), "+Inf"), histogram):
+                    cumulative += count
+                    lines.append(f"http_request_duration_seconds_bucket"
+                                 f"{cls.format_labels(method=method, route=route, le=bound)} {cumulative}")
+                labels: str = cls.format_labels(method=method, route=route)
+                lines.append(f"http_request_duration_seconds_sum{labels} {histogram[-2]}")
+                lines.append(f"http_request_duration_seconds_count{labels} {histogram[-1]}")
+
+            for name, description, attribute in cls.breakdown:
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+                for route, totals in cls._sampled.items():
+                    lines.append(f"{name}{cls.format_labels(route=route)} {totals[attribute]}")
+
+        return "\n".join(lines) + "\n"
+
+
+@require_safe
+def export(request: "HttpRequest") -> HttpResponse:
+    """
+    Prometheus scrape endpoint; scrapers send METRICS_TOKEN as a bearer token. Without a token it does not
+    exist, unless METRICS_PUBLIC is set.
+    """
+    if not settings.METRICS_TOKEN:
+        if not settings.METRICS_PUBLIC:
+            return HttpResponse(status=HTTP_404_NOT_FOUND)
+    elif not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+        return HttpResponse(status=HTTP_401_UNAUTHORIZED)
+
+    response: HttpResponse = HttpResponse(content=MetricsRegistry.render(),
+                                          content_type="text/plain; version=0.0.4; charset=utf-8")
+    add_never_cache_headers(response)
+    return response
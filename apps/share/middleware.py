@@ -0,0 +1,80 @@
+import random
+from contextvars import Token
+from time import perf_counter
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .metrics import MetricsRegistry, RequestMetrics, current_metrics
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest, HttpResponse
+
+
+class InstrumentationMiddleware:
+    """
+    Records every request's wall time per route, and for a METRICS_SAMPLE_RATE share of requests also
+    the time spent in database queries, Redis commands and serializers. The numbers go to the
+    Server-Timing header and to the Prometheus metrics at /metrics. Unsampled requests only pay for
+    two clock reads and a counter update. Keep it first in MIDDLEWARE so the wall time covers the whole
+    stack. It runs natively under both WSGI and ASGI.
+    """
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[["HttpRequest"], "HttpResponse | Awaitable[HttpResponse]"]) -> None:
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: "HttpRequest") -> "HttpResponse | Awaitable[HttpResponse]":
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started: float = perf_counter()
+        metrics: RequestMetrics | None = self.start_sample()
+        token: Token = current_metrics.set(metrics)
+        try:
+            response: "HttpResponse" = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request=request, response=response, started=started, metrics=metrics)
+
+    async def __acall__(self, request: "HttpRequest") -> "HttpResponse":
+        started: float = perf_counter()
+        metrics: RequestMetrics | None = self.start_sample()
+        token: Token = current_metrics.set(metrics)
+        try:
+            response: "HttpResponse" = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request=request, response=response, started=started, metrics=metrics)
+
+    @classmethod
+    def start_sample(cls) -> RequestMetrics | None:
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return None
+        return RequestMetrics()
+
+    @classmethod
+    def get_route(cls, request: "HttpRequest") -> str:
+        # the URL pattern rather than the path, to keep the label set bounded
+        resolver_match = getattr(request, "resolver_match", None)
+        return "unmatched" if resolver_match is None else f"/{resolver_match.route}"
+
+    @classmethod
+    def finish(cls, request: "HttpRequest", response: "HttpResponse", started: float,
+               metrics: RequestMetrics | None) -> "HttpResponse":
+        duration: float = perf_counter() - started
+        MetricsRegistry.observe(method=request.method, route=cls.get_route(request=request),
+                                status=response.status_code, duration=duration, metrics=metrics)
+
+        timings: list[str] = [f"total;dur={duration * 1000:.2f}"]
+        if metrics is not None:
+            timings += metrics.get_server_timing()
+        response["Server-Timing"] = ", ".join(timings)
+        return response
@@ -0,0 +1,103 @@
+import json
+from hashlib import blake2b
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+from .services import ResponseCacheService
+
+if TYPE_CHECKING:
+    from rest_framework.request import Request
+
+
+class CachedResponse(Response):
+    """
+    Response around an already rendered JSON body. It is sent as is to JSON clients; data is only decoded
+    when something asks for it, e.g. the browsable API or a test.
+    """
+
+    def __init__(self, rendered_body: bytes, **kwargs) -> None:
+        self.rendered_body: bytes = rendered_body
+        super().__init__(**kwargs)
+
+    @property
+    def data(self) -> Any:
+        if self._data is None:
+            self._data = json.loads(self.rendered_body)
+        return self._data
+
+    @data.setter
+    def data(self, value: Any) -> None:
+        self._data = value
+
+    @property
+    def rendered_content(self) -> bytes:
+        renderer: BaseRenderer = self.accepted_renderer
+        if renderer.format != "json":
+            return super().rendered_content
+
+        self["Content-Type"] = renderer.media_type if renderer.charset is None \
+            else f"{renderer.media_type}; charset={renderer.charset}"
+        return self.rendered_body
+
+
+class CachedRetrieveMixin:
+    """
+    Serve retrieve() from a per-object cache of the rendered JSON, with a strong ETag and Last-Modified.
+    A matching If-None-Match (or If-Modified-Since) is answered with 304 and a cache hit is returned as is,
+    so neither touches the queryset or the serializer.
+
+    The cached body is shared by every caller: use it only on views whose output does not depend on
+    request.user and whose object permissions need not be checked per request. It is rendered without the
+    request, so file URLs are relative rather than built from the Host of whoever missed the cache first.
+    Invalidate entries with ResponseCacheService.invalidate(prefix=cache_key_prefix, pks=...) whenever the
+    object changes.
+    """
+    cache_key_prefix: str
+    cache_timeout: int | None = None
+
+    def get_cache_key(self) -> str:
+        lookup: str = self.lookup_url_kwarg or self.lookup_field
+        return ResponseCacheService.get_key(prefix=self.cache_key_prefix, pk=self.kwargs[lookup])
+
+    def get_json_renderer(self) -> BaseRenderer:
+        return next((renderer for renderer in self.get_renderers() if renderer.format == "json"), JSONRenderer())
+
+    def render_cache_entry(self) -> dict[str, Any]:
+        instance = self.get_object()
+        serializer = self.get_serializer_class()(instance, context={**self.get_serializer_context(), "request": None})
+        body: bytes = self.get_json_renderer().render(serializer.data)
+        return {
+            "body": body,
+            "etag": f'"{blake2b(body, digest_size=16).hexdigest()}"',
+            "last_modified": int(time()),
+        }
+
+    def is_not_modified(self, request: "Request", entry: dict[str, Any]) -> bool:
+        if_none_match: str | None = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            etags: list[str] = parse_etags(if_none_match)
+            return "*" in etags or entry["etag"] in etags
+
+        if_modified_since: int | None = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        return if_modified_since is not None and entry["last_modified"] <= if_modified_since
+
+    def retrieve(self, request: "Request", *args, **kwargs) -> Response:
+        key: str = self.get_cache_key()
+        entry: dict[str, Any] | None = ResponseCacheService.get(key=key)
+        if entry is None:
+            entry = self.render_cache_entry()
+            ResponseCacheService.set(key=key, entry=entry, timeout=self.cache_timeout)
+
+        if self.is_not_modified(request=request, entry=entry):
+            response: Response = Response(status=HTTP_304_NOT_MODIFIED)
+        else:
+            response = CachedResponse(rendered_body=entry["body"])
+
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        return response
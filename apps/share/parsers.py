@@ -0,0 +1,19 @@
+from typing import IO, Any
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """ JSONParser backed by orjson; the body is read at once, orjson only accepts UTF-8 and rejects NaN. """
+    renderer_class: type[ORJSONRenderer] = ORJSONRenderer
+
+    def parse(self, stream: IO[bytes], media_type: str | None = None,
+              parser_context: dict[str, Any] | None = None) -> Any:
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,45 @@
+import datetime
+from typing import Any
+
+import orjson
+from rest_framework.fields import DateField, DateTimeField, TimeField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson. UUIDs, dicts and lists are encoded natively; datetimes, dates and times
+    are formatted with the configured DATETIME_FORMAT/DATE_FORMAT/TIME_FORMAT, the same way serializer
+    fields do, and every other type falls back to DRF's encoder.
+    """
+    options: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    fields: tuple[tuple[type, DateTimeField | DateField | TimeField], ...] = (
+        # datetime is a subclass of date, so it has to be checked first
+        (datetime.datetime, DateTimeField()),
+        (datetime.date, DateField()),
+        (datetime.time, TimeField()),
+    )
+    encoder: JSONEncoder = JSONEncoder()
+
+    @classmethod
+    def default(cls, obj: Any) -> Any:
+        for klass, field in cls.fields:
+            if isinstance(obj, klass):
+                return field.to_representation(obj)
+        return cls.encoder.default(obj)
+
+    def render(self, data: Any, accepted_media_type: str | None = None,
+               renderer_context: dict[str, Any] | None = None) -> bytes:
+        if data is None:
+            return b""
+
+        options: int = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret: bytes = orjson.dumps(data, default=self.default, option=options)
+        # keep the output a strict javascript subset, like JSONRenderer does
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
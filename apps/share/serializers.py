@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import BaseSerializer, ListSerializer
+from rest_framework.settings import api_settings
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+class ValuesListSerializer(ListSerializer):
+    def to_representation(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = list(data)
+        self.child.prepare(rows=rows)
+        represent: Callable[[dict[str, Any]], dict[str, Any]] = self.child.to_representation
+        return [represent(row) for row in rows]
+
+
+class ValuesSerializer(BaseSerializer):
+    """
+    Read-only serializer for rows of queryset.values(), for list views where ModelSerializer field
+    instantiation and per-field to_representation dominate. `fields` maps every output name to the values()
+    lookup it is read from; an output with a get_<name>(row) method is computed by it instead, like a
+    SerializerMethodField. The accessors are resolved once per serializer instance, which is once per page
+    with many=True, and prepare(rows) runs once per page before the rows are represented, to batch-load
+    related data.
+
+    The view must hand over values() rows, e.g. by returning get_values(queryset) from get_queryset().
+    """
+    fields: dict[str, str] = {}
+
+    class Meta:
+        list_serializer_class: type[ValuesListSerializer] = ValuesListSerializer
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.accessors: tuple[tuple[str, str, Callable[[dict[str, Any]], Any] | None], ...] = tuple(
+            (name, lookup, getattr(self, f"get_{name}", None)) for name, lookup in self.fields.items()
+        )
+
+    @classmethod
+    def get_values(cls, queryset: "QuerySet") -> "QuerySet":
+        return queryset.values(*dict.fromkeys(cls.fields.values()))
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        pass
+
+    def to_representation(self, row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            name: row[lookup] if getter is None else getter(row) for name, lookup, getter in self.accessors
+        }
+
+    def to_internal_value(self, data: Any) -> Any:
+        # a 400 rather than BaseSerializer's NotImplementedError, should a view ever pass it request data
+        raise ValidationError(detail={api_settings.NON_FIELD_ERRORS_KEY: [f"{self.__class__.__name__} is read-only."]},
+                              code="read_only")
@@ -1,26 +1,39 @@
 import datetime
-from typing import TYPE_CHECKING, Type
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from hashlib import blake2b
+from math import ceil
+from pathlib import Path
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Type
 from uuid import UUID
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from redis import Redis
+from django.core.cache import cache
+from django.db import connections
 from user.enums import TokenType
 
+from .utils import get_redis
+
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser
+    from redis import Redis
 
 UserModel: "Type[AbstractBaseUser]" = get_user_model()
 
+logger: logging.Logger = logging.getLogger(__name__)
+
 
 class TokenService:
     @classmethod
-    def get_redis_client(cls) -> Redis:
-        return Redis.from_url(settings.REDIS_URL)
+    def get_redis_client(cls) -> "Redis":
+        return get_redis()
 
     @classmethod
     def get_valid_tokens(cls, user_id: int, token_type: TokenType) -> set[str] | None:
-        redis_client: Redis = cls.get_redis_client()
+        redis_client: "Redis" = cls.get_redis_client()
         token_key: str = f"user:{user_id}:{token_type}"
         valid_tokens: set[str] | None = redis_client.smembers(token_key)
         return valid_tokens
@@ -33,7 +46,7 @@ class TokenService:
             token_type: TokenType,
             expire_time: datetime.timedelta,
     ) -> None:
-        redis_client: Redis = cls.get_redis_client()
+        redis_client: "Redis" = cls.get_redis_client()
 
         token_key: str = f"user:{user_id}:{token_type}"
 
@@ -45,8 +58,174 @@ class TokenService:
 
     @classmethod
     def delete_tokens(cls, user_id: int, token_type: TokenType) -> None:
-        redis_client: Redis = cls.get_redis_client()
+        redis_client: "Redis" = cls.get_redis_client()
         token_key: str = f"user:{user_id}:{token_type}"
         valid_tokens: set[str] | None = redis_client.smembers(token_key)
         if valid_tokens is not None:
             redis_client.delete(token_key)
+
+
+class ResponseCacheService:
+    """ Per-object cache of rendered responses, see share.mixins.CachedRetrieveMixin. """
+
+    @classmethod
+    def get_key(cls, prefix: str, pk: Any) -> str:
+        return f"{prefix}:{pk}"
+
+    @classmethod
+    def get(cls, key: str) -> dict[str, Any] | None:
+        return cache.get(key)
+
+    @classmethod
+    def set(cls, key: str, entry: dict[str, Any], timeout: int | None = None) -> None:
+        cache.set(key, entry, timeout=settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout)
+
+    @classmethod
+    def invalidate(cls, prefix: str, pks: Iterable[Any]) -> None:
+        keys: list[str] = [cls.get_key(prefix=prefix, pk=pk) for pk in pks]
+        if keys:
+            cache.delete_many(keys)
+
+
+class SchemaCacheService:
+    """
+    Rendered OpenAPI schemas, kept per process and in the cache under the code version, so the schema is
+    generated once per deploy instead of on every request.
+    """
+    _local: dict[str, dict[str, Any]] = {}
+    _code_version: str | None = None
+
+    @classmethod
+    def get_code_version(cls) -> str:
+        """ CODE_VERSION when the deploy sets it, otherwise a hash of the project's Python sources. """
+        if cls._code_version is None:
+            cls._code_version = settings.CODE_VERSION or cls.hash_sources()
+        return cls._code_version
+
+    @classmethod
+    def hash_sources(cls) -> str:
+        digest = blake2b(digest_size=8)
+        base_dir: Path = Path(settings.BASE_DIR)
+        for path in sorted((*base_dir.joinpath("apps").rglob("*.py"), *base_dir.joinpath("core").rglob("*.py"))):
+            digest.update(str(path.relative_to(base_dir)).encode())
+            digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def get_key(cls, file_format: str, api_version: str | None, language: str | None) -> str:
+        return f"schema:{cls.get_code_version()}:{api_version or ''}:{language or ''}:{file_format}"
+
+    @classmethod
+    def get_or_build(cls, key: str, build: Callable[[], bytes], force: bool = False) -> dict[str, Any]:
+        entry: dict[str, Any] | None = None if force else cls._local.get(key) or cache.get(key)
+        if entry is None:
+            body: bytes = build()
+            entry = {"body": body, "etag": f'"{blake2b(body, digest_size=16).hexdigest()}"'}
+            cache.set(key, entry, timeout=settings.SCHEMA_CACHE_TIMEOUT)
+        cls._local[key] = entry
+        return entry
+
+
+class HealthService:
+    """
+    Readiness probes for the database, Redis and the Celery broker. The probes run concurrently, each
+    bounded by HEALTH_CHECK_TIMEOUT, and the report is kept in the process for HEALTH_CHECK_CACHE_TIMEOUT
+    seconds so frequent probing does not turn into load on the dependencies. It is deliberately not stored
+    in the Redis cache, which is one of the things being checked.
+    """
+    _report: dict[str, Any] | None = None
+    _checked_at: float = 0.0
+    _lock: Lock = Lock()
+
+    @classmethod
+    def get_database_options(cls, vendor: str, options: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """ The configured driver options plus ones that bound connecting and the query by timeout. """
+        if vendor == "postgresql":
+            # libpq takes whole seconds for connect_timeout, the server milliseconds for statement_timeout
+            server_options: str = f"{options.get('options', '')} -c statement_timeout={ceil(timeout * 1000)}"
+            return {**options, "connect_timeout": max(1, ceil(timeout)), "options": server_options.strip()}
+        if vendor == "mysql":
+            seconds: int = max(1, ceil(timeout))
+            return {**options, "connect_timeout": seconds, "read_timeout": seconds, "write_timeout": seconds}
+        if vendor == "sqlite":
+            return {**options, "timeout": timeout}
+        return options
+
+    @classmethod
+    def check_database(cls, timeout: float) -> None:
+        # a separate connection with the timeouts added to the configured options, so connecting is measured
+        # too and the request's own connection is left alone; closed right after
+        default = connections["default"]
+        options: dict[str, Any] = cls.get_database_options(
+            vendor=default.vendor, options=default.settings_dict["OPTIONS"], timeout=timeout
+        )
+        connection = default.__class__({**default.settings_dict, "OPTIONS": options}, alias=default.alias)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            connection.close()
+
+    @classmethod
+    def check_redis(cls, timeout: float) -> None:
+        from redis import Redis
+
+        client: "Redis" = Redis.from_url(settings.REDIS_URL, socket_timeout=timeout, socket_connect_timeout=timeout)
+        try:
+            client.ping()
+        finally:
+            client.close()
+
+    @classmethod
+    def check_broker(cls, timeout: float) -> None:
+        from core.celery import app
+
+        with app.connection_for_write(connect_timeout=timeout) as connection:
+            connection.ensure_connection(max_retries=0, timeout=timeout)
+
+    @classmethod
+    def get_checks(cls) -> dict[str, Callable[[float], None]]:
+        return {"database": cls.check_database, "redis": cls.check_redis, "broker": cls.check_broker}
+
+    @classmethod
+    def probe(cls, check: Callable[[float], None], timeout: float) -> dict[str, Any]:
+        # the report is public, so the exception (host names, URLs, driver messages) only goes to the log
+        started: float = perf_counter()
+        try:
+            check(timeout)
+        except Exception:
+            logger.exception("Health check %s failed", check.__name__)
+            return {"status": "error", "latency_ms": round((perf_counter() - started) * 1000, 2),
+                    "error": "unavailable"}
+        return {"status": "ok", "latency_ms": round((perf_counter() - started) * 1000, 2)}
+
+    @classmethod
+    def run_checks(cls) -> dict[str, Any]:
+        timeout: float = settings.HEALTH_CHECK_TIMEOUT
+        checks: dict[str, Callable[[float], None]] = cls.get_checks()
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="health")
+        futures = {name: executor.submit(cls.probe, check, timeout) for name, check in checks.items()}
+        deadline: float = monotonic() + timeout
+
+        results: dict[str, dict[str, Any]] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result(timeout=max(0.0, deadline - monotonic()))
+            except FutureTimeoutError:
+                logger.warning("Health check %s did not finish within %ss", name, timeout)
+                results[name] = {"status": "timeout", "latency_ms": round(timeout * 1000, 2)}
+        # a probe stuck past the deadline is left to finish in its thread instead of blocking the response
+        executor.shutdown(wait=False)
+
+        return {
+            "status": "ok" if all(result["status"] == "ok" for result in results.values()) else "error",
+            "checks": results,
+        }
+
+    @classmethod
+    def get_report(cls) -> dict[str, Any]:
+        with cls._lock:
+            if cls._report is None or monotonic() - cls._checked_at >= settings.HEALTH_CHECK_CACHE_TIMEOUT:
+                cls._report = cls.run_checks()
+                cls._checked_at = monotonic()
+            return cls._report
@@ -0,0 +1,9 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import install_query_recorder
+
+
+@receiver(signal=connection_created)
+def record_queries(sender, connection, **kwargs) -> None:
+    install_query_recorder(connection=connection)
@@ -1,16 +1,16 @@
+import os
 import random
 import string
+from importlib import import_module
 from secrets import token_urlsafe
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
 
 from django.conf import settings
 from django.contrib.auth.hashers import make_password, check_password
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
-from django.core.mail.message import EmailMessage
-from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
-from redis import Redis
+from django.views.decorators.csrf import csrf_exempt
 from user.models import Group
 from user.models import Policy
 from user.models import User
@@ -20,10 +20,61 @@ from .exceptions import OTPException
 if TYPE_CHECKING:
     from typing import Type
     from django.contrib.auth.models import AbstractBaseUser
+    from django.http import HttpRequest, HttpResponse
+    from redis import Redis
 
 UserModel: "Type[AbstractBaseUser]" = User
 
-redis_conn: Redis = Redis.from_url(settings.REDIS_URL)
+_redis_client: "Redis | None" = None
+
+
+def get_redis() -> "Redis":
+    """
+    The process-wide client for settings.REDIS_URL, created on first use so importing the apps does not
+    import redis or open a pool, and so gunicorn/celery children do not inherit the master's sockets.
+    """
+    global _redis_client
+    if _redis_client is None:
+        from .clients import InstrumentedRedis
+
+        _redis_client = InstrumentedRedis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def reset_redis() -> None:
+    global _redis_client
+    _redis_client = None
+
+
+os.register_at_fork(after_in_child=reset_redis)
+
+
+class LazyRedis:
+    """ Module-level stand-in for the client that resolves get_redis() on every attribute access. """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_redis(), name)
+
+
+redis_conn: "Redis" = LazyRedis()
+
+
+def lazy_view(import_path: str, **initkwargs) -> Callable[..., "HttpResponse"]:
+    """
+    URLconf entry for a class-based view whose module is expensive to import (drf-spectacular pulls in the
+    schema generator): the view is imported and as_view(**initkwargs) is built on the first request.
+    """
+    view: Callable[..., "HttpResponse"] | None = None
+
+    @csrf_exempt
+    def dispatch(request: "HttpRequest", *args, **kwargs) -> "HttpResponse":
+        nonlocal view
+        if view is None:
+            module_path, class_name = import_path.rsplit(".", 1)
+            view = getattr(import_module(module_path), class_name).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return dispatch
 
 
 def add_permissions(obj: UserModel | Group | Policy, permissions: list[str]) -> None:
@@ -66,6 +117,9 @@ def generate_otp(phone_number_or_email: str, expire_in: int = 120, check_if_exis
 
 
 def send_email(email: str, otp_code: str) -> None:
+    from django.core.mail.message import EmailMessage
+    from django.template.loader import render_to_string
+
     subject: str = "Welcome to Our Service!"
     message: str = render_to_string(template_name="emails/email_template.html", context={
         "email": email,
@@ -1,3 +1,50 @@
-from django.shortcuts import render
+from typing import TYPE_CHECKING, Any
 
-# Create your views here.
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.views import SpectacularAPIView
+from rest_framework.status import HTTP_304_NOT_MODIFIED
+
+from .services import SchemaCacheService
+
+if TYPE_CHECKING:
+    from rest_framework.renderers import BaseRenderer
+    from rest_framework.request import Request
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    SpectacularAPIView that generates the schema once per code version, format and language and serves the
+    rendered bytes from SchemaCacheService, with an ETag. The schema is generated without the request, so
+    the cached copy is the same for every caller; `manage.py cache_schema` builds it ahead of traffic.
+    """
+
+    def get_schema_entry(self, renderer: "BaseRenderer", version: str | None, force: bool = False) -> dict[str, Any]:
+        def build() -> bytes:
+            generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+            return renderer.render(generator.get_schema(request=None, public=self.serve_public), renderer_context={})
+
+        return SchemaCacheService.get_or_build(
+            key=SchemaCacheService.get_key(file_format=renderer.format, api_version=version,
+                                           language=translation.get_language()),
+            build=build, force=force
+        )
+
+    def _get_schema_response(self, request: "Request") -> HttpResponse:
+        version: str | None = self.api_version or request.version or self._get_version_parameter(request)
+        renderer: "BaseRenderer" = request.accepted_renderer
+        entry: dict[str, Any] = self.get_schema_entry(renderer=renderer, version=version)
+
+        if entry["etag"] in parse_etags(request.headers.get("If-None-Match", "")):
+            response: HttpResponse = HttpResponse(status=HTTP_304_NOT_MODIFIED)
+        else:
+            content_type: str = renderer.media_type if renderer.charset is None \
+                else f"{renderer.media_type}; charset={renderer.charset}"
+            response = HttpResponse(content=entry["body"], content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, version)}"'
+
+        response["ETag"] = entry["etag"]
+        patch_vary_headers(response, ("Accept",))
+        return response
@@ -0,0 +1,58 @@
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image as PILImage
+from product.models import Image
+from product.services import ImageService
+
+
+def make_jpeg(width=800, height=600):
+    buffer = BytesIO()
+    exif = PILImage.Exif()
+    exif[0x010F] = "Camera Maker"
+    PILImage.new("RGB", (width, height), color="red").save(buffer, format="JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+def test_build_variants_widths_and_format():
+    variants = ImageService.build_variants(make_jpeg(), widths=(160, 320, 640, 1024))
+
+    assert sorted(variants) == [160, 320, 640]
+    for width, content in variants.items():
+        with PILImage.open(BytesIO(content)) as variant:
+            assert variant.format == "WEBP"
+            assert variant.width == width
+            assert variant.height == round(600 * width / 800)
+            assert not variant.getexif()
+
+
+def test_variant_name():
+    assert ImageService.get_variant_name("products/photo.jpg", 320) == "products/photo_320w.webp"
+
+
+@pytest.mark.django_db
+def test_generate_variants_and_srcset(settings, tmp_path, product_factory, user_factory):
+    settings.MEDIA_ROOT = tmp_path
+    product = product_factory(seller=user_factory(id=uuid4()))
+    image = Image.objects.create(
+        product_id=product, image=SimpleUploadedFile("photo.jpg", make_jpeg(), content_type="image/jpeg")
+    )
+
+    stored = ImageService.generate_variants(image)
+    image.refresh_from_db()
+
+    assert image.variants == stored
+    assert set(ImageService.get_srcset(image)) == {"160w", "320w", "640w"}
+    assert all((tmp_path / name).exists() for name in stored.values())
+
+
+def test_batch_task_fans_out(mocker):
+    from product.tasks import generate_image_variants, generate_image_variants_batch
+
+    delay = mocker.patch.object(generate_image_variants, "delay")
+    image_ids = [uuid4(), uuid4()]
+
+    assert generate_image_variants_batch(image_ids) == 2
+    assert [call.kwargs["image_id"] for call in delay.call_args_list] == [str(image_id) for image_id in image_ids]
@@ -0,0 +1,118 @@
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from product.models import Color, Image, ProductVariant
+from user.models import Group
+
+
+def product_queries(context):
+    return [query for query in context.captured_queries if '"product_' in query["sql"]]
+
+
+@pytest.mark.django_db
+class TestProductDetailCache:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory, product_factory):
+        self.user = user_factory(id=uuid4())
+        self.user.groups.add(Group.objects.get(name="buyer"))
+        access, _ = tokens(self.user)
+        self.client = api_client(token=access)
+
+        self.category = category_factory(name="Shoes")
+        self.product = product_factory(category=self.category, seller=self.user, title="Runner")
+        self.url = f"/api/products/{self.product.id}/"
+
+    def test_sets_validators(self):
+        response = self.client.get(self.url)
+
+        assert response.status_code == 200
+        assert response["ETag"].startswith('"') and not response["ETag"].startswith('W/')
+        assert "Last-Modified" in response
+        assert response.json()["title"] == "Runner"
+
+    def test_cache_hit_skips_product_queries(self):
+        first = self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(self.url)
+
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+        assert product_queries(context) == []
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response["ETag"] == etag
+        assert product_queries(context) == []
+
+    def test_if_modified_since_returns_not_modified(self):
+        last_modified = self.client.get(self.url)["Last-Modified"]
+
+        assert self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+        assert self.client.get(self.url, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT").status_code == 200
+
+    @pytest.mark.parametrize("change", ["product", "image", "category", "color"])
+    def test_changes_invalidate_entry(self, change, django_capture_on_commit_callbacks):
+        color = Color.objects.create(name="red")
+        ProductVariant.objects.create(product=self.product, color=color, quantity=1)
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            if change == "product":
+                self.product.title = "Trail runner"
+                self.product.save()
+            elif change == "image":
+                Image.objects.create(product_id=self.product, image="products/runner.jpg", position=0)
+            elif change == "category":
+                self.category.name = "Footwear"
+                self.category.save()
+            else:
+                color.name = "crimson"
+                color.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_child_category_change_invalidates_parent_products(self, category_factory,
+                                                               django_capture_on_commit_callbacks):
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category_factory(name="Sandals", parent=self.category)
+
+        response = self.client.get(self.url)
+        assert response["ETag"] != etag
+        assert [child["name"] for child in response.data["category"]["children"]] == ["Sandals"]
+
+    def test_host_does_not_leak_into_entry(self):
+        Image.objects.create(product_id=self.product, image="products/runner.jpg", position=0)
+
+        poisoned = self.client.get(self.url, HTTP_HOST="evil.example")
+        response = self.client.get(self.url)
+
+        assert b"evil.example" not in poisoned.content
+        assert response.content == poisoned.content
+        assert response.json()["images"][0]["image"].startswith("/media/")
+
+    def test_invalidates_after_commit(self, django_capture_on_commit_callbacks):
+        etag = self.client.get(self.url)["ETag"]
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            self.product.title = "Trail runner"
+            self.product.save()
+            # nothing is invalidated until the transaction commits
+            assert self.client.get(self.url)["ETag"] == etag
+
+        for callback in callbacks:
+            callback()
+        assert self.client.get(self.url)["ETag"] != etag
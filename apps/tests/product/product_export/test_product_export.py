@@ -0,0 +1,69 @@
+import csv
+import json
+from io import StringIO
+from uuid import uuid4
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from user.models import Group
+
+
+@pytest.mark.django_db
+class TestProductExport:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory, product_factory):
+        self.seller = user_factory(id=uuid4())
+        self.seller.groups.add(Group.objects.get(name="seller"))
+        access, _ = tokens(self.seller)
+        self.client = api_client(token=access)
+        self.buyer = user_factory(id=uuid4())
+        self.buyer.groups.add(Group.objects.get(name="buyer"))
+        self.buyer_client = api_client(token=tokens(self.buyer)[0])
+
+        self.category = category_factory(name="Electronics")
+        self.products = product_factory.create_batch(5, category=self.category, seller=self.seller,
+                                                     description="multi\nline, \"quoted\"")
+        product_factory(seller=self.seller)
+        self.other = product_factory(category=self.category, seller=user_factory(id=uuid4()))
+        self.url = "/api/products/export/"
+
+    def test_export_csv(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, {"category": str(self.category.id)})
+            content = b"".join(response.streaming_content).decode()
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(StringIO(content)))
+        assert {row["id"] for row in rows} == {str(product.id) for product in self.products}
+        assert rows[0]["category"] == "Electronics"
+        assert rows[0]["seller_email"] == self.seller.email
+        assert rows[0]["description"] == "multi\nline, \"quoted\""
+        assert len([query for query in context.captured_queries if '"product_product"' in query["sql"]]) == 1
+
+    def test_export_jsonl(self):
+        response = self.client.get(self.url, {"file_format": "jsonl"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        assert response.status_code == 200
+        assert len(rows) == 6
+        assert {row["price"] for row in rows} == {str(product.price) for product in self.seller.product_set.all()}
+
+    def test_export_is_limited_to_own_products(self):
+        response = self.client.get(self.url, {"file_format": "jsonl", "seller": str(self.other.seller_id)})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        assert {row["seller_id"] for row in rows} == {str(self.seller.id)}
+        assert self.buyer_client.get(self.url).status_code == 403
+
+    def test_export_invalid_format(self):
+        response = self.client.get(self.url, {"file_format": "xml"})
+        assert response.status_code == 400
+
+    def test_export_command(self, tmp_path):
+        path = tmp_path / "products.jsonl"
+        call_command("export_products", str(path), "--format", "jsonl", "--chunk-size", "2", stderr=StringIO())
+
+        assert len(path.read_text().splitlines()) == 7
@@ -0,0 +1,188 @@
+from decimal import Decimal
+from io import BytesIO
+from time import monotonic
+from uuid import uuid4
+
+import pytest
+from product.facets import FacetIndex, FacetService, price_buckets
+from product.models import Color, Product, ProductVariant, Size
+from product.services import ProductImportService
+from user.models import Group
+
+PRODUCTS = [(1, "a", Decimal("10")), (2, "a", Decimal("75")), (3, "b", Decimal("75")), (4, "b", Decimal("2000"))]
+VARIANTS = [(1, "Red", "m", 0), (1, "Blue", "m", 3), (2, "red", "m", 1), (2, "red", "l", 0), (3, "blue", "l", 2),
+            (4, "green", None, 0)]
+
+
+@pytest.fixture
+def index():
+    return FacetIndex.from_rows(products=PRODUCTS, variants=VARIANTS, price_bounds=(0, 50, 100, 500, 1000))
+
+
+def test_counts_without_selection(index):
+    assert index.counts() == {
+        "category": {"a": 2, "b": 2},
+        "colors": {"blue": 2, "green": 1, "red": 2},
+        "sizes": {"l": 2, "m": 2},
+        "price": {"0-50": 1, "1000+": 1, "50-100": 2},
+    }
+
+
+def test_or_facet_ignores_own_selection(index):
+    counts = index.counts(selected={"colors": ["red"], "sizes": ["l"]})
+
+    assert counts["colors"] == {"blue": 1, "red": 1}
+    assert counts["sizes"] == {"l": 1, "m": 2}
+    assert counts["category"] == {"a": 1}
+
+
+def test_and_facet(index):
+    counts = index.counts(selected={"colors": ["red", "blue"]}, operators={"colors": "and"})
+
+    assert counts["category"] == {"a": 1}
+    assert counts["colors"] == {"blue": 1, "red": 1}
+
+
+def test_price_buckets():
+    assert price_buckets((0, 50, 1000)) == {
+        "0-50": (None, Decimal("50")), "50-1000": (Decimal("50"), Decimal("1000")), "1000+": (Decimal("1000"), None)
+    }
+    assert price_buckets((100,)) == {"100+": (None, None)}
+
+
+@pytest.mark.parametrize("variant, expected", [
+    ({"in_stock": True}, {"a": 2, "b": 1}),
+    ({"in_stock": False}, {"a": 2, "b": 1}),
+    ({"color": "RED", "in_stock": True}, {"a": 1}),
+    ({"color": "red", "size": "l", "in_stock": True}, {}),
+    ({"color": None, "size": None, "in_stock": None}, {"a": 2, "b": 2}),
+])
+def test_variant_filters_narrow_counts(index, variant, expected):
+    assert index.counts(variant=variant)["category"] == expected
+
+
+@pytest.mark.django_db
+class TestListFacets:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory, product_factory):
+        user = user_factory(id=uuid4())
+        user.groups.add(Group.objects.get(name="buyer"))
+        access, _ = tokens(user)
+        self.client = api_client(token=access)
+
+        self.category = category_factory()
+        red, blue = Color.objects.create(name="red"), Color.objects.create(name="blue")
+        small, large = Size.objects.create(name="s"), Size.objects.create(name="l")
+        self.cheap, self.mid, self.both = [
+            product_factory(category=self.category, seller=user, price=price) for price in ("20", "60", "70")
+        ]
+        ProductVariant.objects.bulk_create([
+            ProductVariant(product=self.cheap, color=red, size=small, quantity=0),
+            ProductVariant(product=self.mid, color=blue, size=large, quantity=5),
+            ProductVariant(product=self.both, color=red, size=small, quantity=2),
+            ProductVariant(product=self.both, color=blue, size=small, quantity=0),
+        ])
+        self.url = f"/api/products/categories/{self.category.id}/products/"
+
+    @pytest.mark.parametrize("params, expected", [
+        ({}, {"cheap", "mid", "both"}),
+        ({"colors": "red"}, {"cheap", "both"}),
+        ({"colors": "red,blue", "colors_op": "and"}, {"both"}),
+        ({"colors": "blue", "sizes": "s"}, {"both"}),
+        ({"price": "50-100"}, {"mid", "both"}),
+        ({"price": "0-50,50-100", "sizes": "l"}, {"mid"}),
+        ({"in_stock": "true"}, {"mid", "both"}),
+        ({"color": "red", "in_stock": "true", "colors": "red,blue"}, {"both"}),
+        ({"color": "blue", "size": "s", "in_stock": "true"}, set()),
+    ])
+    def test_results_match_facet_counts(self, params, expected):
+        response = self.client.get(self.url, params)
+
+        assert response.status_code == 200
+        ids = {item["id"] for item in response.data["results"]}
+        assert ids == {str(getattr(self, name).id) for name in expected}
+        assert sum(response.data["facets"]["category"].values()) == len(expected)
+
+    def test_facets_follow_product_changes(self, product_factory, django_capture_on_commit_callbacks):
+        assert self.client.get(self.url).data["facets"]["price"] == {"0-50": 1, "50-100": 2}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            product_factory(category=self.category, seller=self.cheap.seller, price="700")
+
+        assert self.client.get(self.url).data["facets"]["price"] == {"0-50": 1, "50-100": 2, "500-1000": 1}
+
+    @pytest.mark.parametrize("price", ["10-20", "50-100,abc", "0-"])
+    def test_price_must_be_a_bucket(self, price):
+        response = self.client.get(self.url, {"price": price})
+
+        assert response.status_code == 400
+        assert "price" in response.data
+
+    def test_prices_below_the_first_bound_count_in_the_first_bucket(self, settings, product_factory):
+        settings.PRODUCT_PRICE_BUCKETS = 25, 50, 100
+        product_factory(category=self.category, seller=self.cheap.seller, price="5")
+
+        response = self.client.get(self.url, {"price": "25-50"})
+
+        assert response.data["facets"]["price"]["25-50"] == len(response.data["results"]) == 2
+
+    def test_invalid_category_is_rejected(self):
+        response = self.client.get(self.url, {"category": f"{self.category.id},abc"})
+
+        assert response.status_code == 400
+        assert "category" in response.data
+
+    def test_facets_follow_variant_changes(self, django_capture_on_commit_callbacks):
+        assert self.client.get(self.url).data["facets"]["colors"] == {"blue": 2, "red": 2}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductVariant.objects.create(product=self.mid, color=Color.objects.get(name="red"), quantity=1)
+
+        assert self.client.get(self.url).data["facets"]["colors"] == {"blue": 2, "red": 3}
+
+    def test_changes_only_invalidate_their_categories(self, category_factory, django_capture_on_commit_callbacks):
+        other = category_factory()
+        key = FacetService.get_category_key(category_id=self.category.id)
+        other_key = FacetService.get_category_key(category_id=other.id)
+        version, other_version = FacetService.get_version(key=key), FacetService.get_version(key=other_key)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.cheap.title = "renamed"
+            self.cheap.save()
+        assert FacetService.get_version(key=key) != version
+        assert FacetService.get_version(key=other_key) == other_version
+
+        version = FacetService.get_version(key=key)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.cheap.category = other
+            self.cheap.save()
+        assert FacetService.get_version(key=key) != version
+        assert FacetService.get_version(key=other_key) != other_version
+
+    def test_renamed_color_invalidates_every_index(self, django_capture_on_commit_callbacks):
+        assert self.client.get(self.url).data["facets"]["colors"] == {"blue": 2, "red": 2}
+
+        red = Color.objects.get(name="red")
+        red.name = "crimson"
+        with django_capture_on_commit_callbacks(execute=True):
+            red.save()
+
+        assert self.client.get(self.url).data["facets"]["colors"] == {"blue": 2, "crimson": 2}
+
+    def test_import_invalidates_facets(self):
+        assert self.client.get(self.url).data["facets"]["price"] == {"0-50": 1, "50-100": 2}
+
+        ProductImportService.import_products(
+            stream=BytesIO(f"title,price,category\nimported,700,{self.category.id}\n".encode()), file_format="csv",
+            seller=self.cheap.seller
+        )
+
+        assert self.client.get(self.url).data["facets"]["price"] == {"0-50": 1, "50-100": 2, "500-1000": 1}
+
+    def test_local_index_expires(self, settings, mocker):
+        key = FacetService.get_category_key(category_id=self.category.id)
+        index = FacetService.get_index(key=key, queryset=Product.objects.filter(category=self.category))
+        assert FacetService.get_index(key=key, queryset=Product.objects.none()) is index
+
+        mocker.patch("product.facets.monotonic", return_value=monotonic() + settings.PRODUCT_FACET_LOCAL_TIMEOUT + 1)
+        assert FacetService.get_index(key=key, queryset=Product.objects.none()) is not index
@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from product.models import Image
+from user.models import Group
+
+
+@pytest.mark.django_db
+class TestProductGallery:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory, product_factory):
+        self.user = user_factory(id=uuid4())
+        self.user.groups.add(Group.objects.get(name="buyer"))
+        access, _ = tokens(self.user)
+        self.client = api_client(token=access)
+
+        self.category = category_factory()
+        self.products = product_factory.create_batch(3, category=self.category, seller=self.user)
+        for product in self.products:
+            for position in (2, 0, 1):
+                Image.objects.create(product_id=product, image=f"products/{product.id}_{position}.jpg",
+                                     position=position)
+
+    def test_list_returns_primary_image_only(self):
+        response = self.client.get(f"/api/products/categories/{self.category.id}/products/")
+
+        assert response.status_code == 200
+        for item in response.data["results"]:
+            assert item["image"].endswith(f"{item['id']}_0.jpg")
+            assert "images" not in item
+
+    def test_list_loads_images_in_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(f"/api/products/categories/{self.category.id}/products/")
+
+        image_queries = [query for query in context.captured_queries if '"product_image"' in query["sql"]]
+        assert len(image_queries) == 1
+
+    def test_detail_returns_ordered_gallery(self):
+        product = self.products[0]
+        response = self.client.get(f"/api/products/{product.id}/")
+
+        assert response.status_code == 200
+        assert [image["position"] for image in response.data["images"]] == [0, 1, 2]
+        assert response.data["image"].endswith(f"{product.id}_0.jpg")
+
+    def test_list_and_detail_agree_on_tied_primary_image(self):
+        product = self.products[1]
+        for name in ("a", "b", "c"):
+            Image.objects.create(product_id=product, image=f"products/{product.id}_tie_{name}.jpg", position=0)
+        first = Image.objects.filter(product_id=product).first()
+
+        items = self.client.get(f"/api/products/categories/{self.category.id}/products/").data["results"]
+        detail = self.client.get(f"/api/products/{product.id}/").data
+
+        assert next(item for item in items if item["id"] == str(product.id))["image"].endswith(first.image.name)
+        assert detail["image"].endswith(first.image.name)
+        assert detail["images"][0]["image"].endswith(first.image.name)
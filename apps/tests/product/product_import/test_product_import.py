@@ -0,0 +1,185 @@
+import json
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from product.models import Product, ProductVariant, Color
+from product.services import ProductImportService
+from user.models import Group
+
+CSV_ROWS = (
+    "title,description,price,quantity,category,colors,sizes\n"
+    "Kettle,Steel kettle,19.90,5,Electronics,Black;Red,\n"
+    "Toaster,,29.5,3,electronics,black,Small\n"
+    ",,10,1,Electronics,,\n"
+    "Blender,,12.345,1,Unknown,,\n"
+)
+
+
+@pytest.fixture
+def seller(user_factory):
+    return user_factory(id=uuid4())
+
+
+@pytest.mark.django_db
+def test_import_csv(settings, tmp_path, seller, category_factory):
+    settings.MEDIA_ROOT = tmp_path
+    category = category_factory(name="Electronics")
+
+    result = ProductImportService.import_products(
+        stream=BytesIO(CSV_ROWS.encode()), file_format="csv", seller=seller, batch_size=2
+    )
+
+    assert result["created"] == 2 and result["failed"] == 2
+    assert set(Product.objects.filter(category=category, seller=seller).values_list("title", flat=True)) == {
+        "Kettle", "Toaster"
+    }
+    assert set(Color.objects.values_list("name", flat=True)) == {"black", "red"}
+    assert Product.objects.get(title="Toaster").sizes.get().name == "small"
+    assert set(ProductVariant.objects.values_list("product__title", "color__name", "size__name", "quantity")) == {
+        ("Kettle", "black", None, 5), ("Kettle", "red", None, 5), ("Toaster", "black", "small", 3)
+    }
+
+    with default_storage.open(result["report"]) as report:
+        lines = report.read().decode().splitlines()
+    assert lines[0] == "row,errors"
+    assert lines[1].startswith("3,title is required.")
+    assert lines[2].startswith("4,price must be") and "category 'Unknown' does not exist." in lines[2]
+
+
+@pytest.mark.django_db
+def test_import_jsonl(seller, category_factory):
+    category = category_factory(name="Books")
+    lines = [
+        json.dumps({"title": "Novel", "price": "9.99", "quantity": 2, "category": str(category.id),
+                    "colors": ["White"]}),
+        "",
+        json.dumps({"title": "Atlas", "price": 25, "category": "books"}),
+    ]
+
+    result = ProductImportService.import_products(
+        stream=BytesIO("\n".join(lines).encode()), file_format="jsonl", seller=seller
+    )
+
+    assert result == {"created": 2, "failed": 0, "report": None}
+    assert Product.objects.get(title="Novel").colors.get().name == "white"
+
+
+@pytest.mark.django_db
+def test_import_invalid_json_line(settings, tmp_path, seller):
+    settings.MEDIA_ROOT = tmp_path
+
+    result = ProductImportService.import_products(stream=BytesIO(b"{not json\n[1]\n"), file_format="jsonl",
+                                                  seller=seller)
+
+    assert result["created"] == 0 and result["failed"] == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("field, value, error", [
+    ("colors", 5, "colors must be a list of names or a ';' separated string."),
+    ("sizes", ["M", {"name": "L"}], "sizes must be a list of names or a ';' separated string."),
+    ("description", {"a": 1}, "description must be a string."),
+    ("title", ["Novel"], "title must be a string."),
+])
+def test_import_reports_wrongly_typed_values(settings, tmp_path, seller, category_factory, field, value, error):
+    settings.MEDIA_ROOT = tmp_path
+    category_factory(name="Books")
+    lines = [json.dumps({"title": "Novel", "price": "9.99", "category": "books", field: value}),
+             json.dumps({"title": "Atlas", "price": "25", "category": "books", "description": "Maps"})]
+
+    result = ProductImportService.import_products(
+        stream=BytesIO("\n".join(lines).encode()), file_format="jsonl", seller=seller
+    )
+
+    assert result["created"] == 1 and result["failed"] == 1
+    assert Product.objects.get().description == "Maps"
+    with default_storage.open(result["report"]) as report:
+        assert report.read().decode().splitlines()[1] == f"1,{error}"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("file_format, content", [
+    ("csv", b"title,price,category\nKettle,19.90,Books\nCaf\xe9,5,Books\n"),
+    ("jsonl", b'{"title": "Kettle", "price": 19.9, "category": "Books"}\n{"title": "Caf\xe9", "price": 5}\n'),
+])
+def test_import_reports_invalid_utf8_rows(settings, tmp_path, seller, category_factory, file_format, content):
+    settings.MEDIA_ROOT = tmp_path
+    category_factory(name="Books")
+
+    result = ProductImportService.import_products(stream=BytesIO(content), file_format=file_format, seller=seller)
+
+    assert result["created"] == 1 and result["failed"] == 1
+    assert Product.objects.get().title == "Kettle"
+    with default_storage.open(result["report"]) as report:
+        assert report.read().decode().splitlines()[1] == "2,Row is not valid UTF-8."
+
+
+@pytest.mark.parametrize("value, expected", [(None, 0), ("", 0), ("7", 7), (3.0, 3), (2147483647, 2147483647)])
+def test_parse_quantity(value, expected):
+    assert ProductImportService.parse_quantity(value) == expected
+
+
+@pytest.mark.parametrize("value", [3.5, "3.5", -1, 2147483648, "99999999999", True, "many", [1]])
+def test_parse_quantity_rejects(value):
+    with pytest.raises((TypeError, ValueError)):
+        ProductImportService.parse_quantity(value)
+
+
+@pytest.mark.django_db
+def test_import_rejects_out_of_range_quantity(settings, tmp_path, seller, category_factory):
+    settings.MEDIA_ROOT = tmp_path
+    category_factory(name="Books")
+    lines = [json.dumps({"title": "Novel", "price": "9.99", "quantity": quantity, "category": "books"})
+             for quantity in (2, 2.5, 10 ** 12)]
+
+    result = ProductImportService.import_products(
+        stream=BytesIO("\n".join(lines).encode()), file_format="jsonl", seller=seller
+    )
+
+    assert result["created"] == 1 and result["failed"] == 2
+    assert Product.objects.get(title="Novel").quantity == 2
+
+
+@pytest.mark.django_db
+class TestImportStatus:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, settings, tmp_path, mocker):
+        settings.MEDIA_ROOT = tmp_path
+        self.clients = []
+        for _ in range(2):
+            user = user_factory(id=uuid4())
+            user.groups.add(Group.objects.get(name="seller"))
+            self.clients.append(api_client(token=tokens(user)[0]))
+
+        self.task_id = str(uuid4())
+        mocker.patch("product.views.import_products.delay", return_value=mocker.Mock(id=self.task_id,
+                                                                                     status="PENDING"))
+        self.result = mocker.patch("product.views.AsyncResult").return_value
+
+    def start_import(self, client):
+        response = client.post("/api/products/import/", data={
+            "file": SimpleUploadedFile("products.csv", CSV_ROWS.encode(), content_type="text/csv"), "format": "csv"
+        }, format="multipart")
+        assert response.status_code == 202
+        return response.json()["task_id"]
+
+    def test_owner_sees_result(self):
+        self.result.status = "SUCCESS"
+        self.result.successful.return_value = True
+        self.result.result = {"created": 2, "failed": 0, "report": None}
+        task_id = self.start_import(self.clients[0])
+
+        response = self.clients[0].get(f"/api/products/import/{task_id}/")
+
+        assert response.status_code == 200
+        assert response.json() == {"task_id": task_id, "status": "SUCCESS", "created": 2, "failed": 0,
+                                   "report": None}
+
+    def test_other_seller_and_unknown_task(self):
+        task_id = self.start_import(self.clients[0])
+
+        assert self.clients[1].get(f"/api/products/import/{task_id}/").status_code == 404
+        assert self.clients[0].get(f"/api/products/import/{uuid4()}/").status_code == 404
@@ -0,0 +1,114 @@
+from decimal import Decimal
+from importlib import import_module
+from uuid import uuid4
+
+import pytest
+from django.apps import apps as django_apps
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from product.models import Color, Size, ProductVariant
+from user.models import Group
+
+
+@pytest.mark.django_db
+class TestProductVariants:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory, product_factory):
+        self.user = user_factory(id=uuid4())
+        self.user.groups.add(Group.objects.get(name="buyer"))
+        access, _ = tokens(self.user)
+        self.client = api_client(token=access)
+
+        self.category = category_factory()
+        self.red, self.blue = Color.objects.create(name="red"), Color.objects.create(name="blue")
+        self.small, self.medium = Size.objects.create(name="s"), Size.objects.create(name="m")
+
+        self.red_m, self.red_s_sold_out, self.blue_m = product_factory.create_batch(
+            3, category=self.category, seller=self.user
+        )
+        ProductVariant.objects.create(product=self.red_m, color=self.red, size=self.medium, quantity=4)
+        ProductVariant.objects.create(product=self.red_m, color=self.blue, size=self.small, quantity=1,
+                                      price=Decimal("5.00"))
+        ProductVariant.objects.create(product=self.red_s_sold_out, color=self.red, size=self.small, quantity=0)
+        ProductVariant.objects.create(product=self.red_s_sold_out, color=self.blue, size=self.medium, quantity=2)
+        ProductVariant.objects.create(product=self.blue_m, color=self.blue, size=self.medium, quantity=3)
+
+        self.url = f"/api/products/categories/{self.category.id}/products/"
+
+    @pytest.mark.parametrize("params, expected", [
+        ({"color": "RED"}, {"red_m", "red_s_sold_out"}),
+        ({"color": "red", "in_stock": "true"}, {"red_m"}),
+        ({"color": "red", "size": "s", "in_stock": "true"}, set()),
+        ({"color": "blue", "size": "m", "in_stock": "true"}, {"red_s_sold_out", "blue_m"}),
+        ({"size": "s", "in_stock": "false"}, {"red_s_sold_out"}),
+        ({}, {"red_m", "red_s_sold_out", "blue_m"}),
+    ])
+    def test_filter_by_variant(self, params, expected):
+        response = self.client.get(self.url, params)
+
+        assert response.status_code == 200
+        assert {item["id"] for item in response.data["results"]} == {
+            str(getattr(self, name).id) for name in expected
+        }
+
+    def test_filter_is_single_query_without_distinct(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url, {"color": "red", "size": "m", "in_stock": "true"})
+
+        product_queries = [query["sql"] for query in context.captured_queries
+                           if query["sql"].startswith('SELECT "product_product"."id"') and "LIMIT" in query["sql"]]
+        assert product_queries and "DISTINCT" not in product_queries[-1]
+        assert product_queries[-1].count("EXISTS") == 1
+
+    def test_list_returns_available_variants(self):
+        response = self.client.get(self.url)
+
+        available = {item["id"]: item["available_variants"] for item in response.data["results"]}
+        assert available == {str(self.red_m.id): 2, str(self.red_s_sold_out.id): 1, str(self.blue_m.id): 1}
+
+    def test_detail_returns_variants(self):
+        response = self.client.get(f"/api/products/{self.red_m.id}/")
+
+        assert response.status_code == 200
+        variants = {(item["color"], item["size"]): item for item in response.data["variants"]}
+        assert variants[("red", "m")]["price"] == str(self.red_m.price)
+        assert variants[("blue", "s")]["price"] == "5.00"
+
+    def test_color_size_combination_is_unique(self):
+        with pytest.raises(IntegrityError):
+            ProductVariant.objects.create(product=self.blue_m, color=self.blue, size=self.medium)
+
+    @pytest.mark.parametrize("attributes", [{"color": "blue"}, {"size": "medium"}, {}])
+    def test_variants_without_color_or_size_are_unique(self, attributes):
+        attributes = {name: getattr(self, value) for name, value in attributes.items()}
+        ProductVariant.objects.create(product=self.blue_m, **attributes)
+
+        with pytest.raises(IntegrityError):
+            ProductVariant.objects.create(product=self.blue_m, **attributes)
+
+
+@pytest.mark.django_db
+def test_backfill_builds_variants_from_colors_and_sizes(user_factory, category_factory, product_factory):
+    backfill = import_module("product.migrations.0011_backfill_product_variants")
+    seller, category = user_factory(id=uuid4()), category_factory()
+    red, blue = Color.objects.create(name="red"), Color.objects.create(name="blue")
+    small = Size.objects.create(name="s")
+    combined, plain, done = product_factory.create_batch(3, category=category, seller=seller, quantity=3)
+    combined.colors.add(red, blue)
+    combined.sizes.add(small)
+    ProductVariant.objects.create(product=done, color=red, quantity=1)
+
+    backfill.build_variants(apps=django_apps, schema_editor=None)
+
+    # the factories hand out string ids, values_list gives UUIDs back
+    rows = {(str(product), color and str(color), size and str(size), quantity)
+            for product, color, size, quantity in ProductVariant.objects.values_list("product", "color", "size",
+                                                                                      "quantity")}
+    assert rows == {
+        (str(combined.pk), str(red.pk), str(small.pk), 3), (str(combined.pk), str(blue.pk), str(small.pk), 3),
+        (str(plain.pk), None, None, 3), (str(done.pk), str(red.pk), None, 1),
+    }
+
+    backfill.remove_variants(apps=django_apps, schema_editor=None)
+
+    assert [str(pk) for pk in ProductVariant.objects.values_list("product", flat=True)] == [str(done.pk)]
@@ -0,0 +1,98 @@
+import json
+from operator import itemgetter
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from product.models import Category, Image, Product, ProductVariant, Size
+from product.serializers import CategorySerializer, CategoryValuesSerializer, ProductSerializer, \
+    ProductValuesSerializer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from user.models import Group
+
+
+def render(serializer):
+    return JSONRenderer().render(serializer.data)
+
+
+@pytest.mark.django_db
+class TestValuesSerializers:
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory, category_factory, product_factory):
+        self.context = {"request": Request(APIRequestFactory().get("/api/products/"))}
+        self.user = user_factory(id=uuid4(), phone_number="+998901234567")
+
+        self.root = category_factory(name="Clothes", icon="categories/clothes.png")
+        self.category = category_factory(name="Shoes", parent=self.root, icon="categories/shoes.png")
+        child = category_factory(name="Sandals", parent=self.category, icon="categories/sandals.png")
+        category_factory(name="Flip-flops", parent=child)
+
+        self.products = [
+            product_factory(category=self.category, seller=self.user, price="19.9"),
+            product_factory(category=self.category, seller=self.user, price="250", description=None),
+            product_factory(category=self.root, seller=self.user, price="7.05"),
+        ]
+        for position in (1, 0):
+            Image.objects.create(product_id=self.products[0], image=f"products/first_{position}.jpg",
+                                 position=position, variants={"320": f"products/first_{position}_320w.webp"})
+        Image.objects.create(product_id=self.products[2], image="products/third.jpg")
+        ProductVariant.objects.create(product=self.products[0], size=Size.objects.create(name="41"), sku="SKU-1",
+                                      quantity=3)
+        ProductVariant.objects.create(product=self.products[0], size=Size.objects.create(name="42"), sku="SKU-2",
+                                      quantity=0)
+
+    def test_category_parity(self):
+        queryset = Category.objects.order_by("name")
+
+        expected = render(CategorySerializer(queryset, many=True, context=self.context))
+        actual = render(CategoryValuesSerializer(CategoryValuesSerializer.get_values(queryset), many=True,
+                                                 context=self.context))
+
+        assert actual == expected
+
+    def test_product_parity(self):
+        queryset = Product.objects.order_by("price")
+
+        expected = render(ProductSerializer(queryset.with_primary_image().with_variant_availability(), many=True,
+                                            context=self.context))
+        actual = render(ProductValuesSerializer(ProductValuesSerializer.get_values(queryset), many=True,
+                                                context=self.context))
+
+        assert actual == expected
+
+    def test_product_page_query_count_is_constant(self, product_factory):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                ProductValuesSerializer(ProductValuesSerializer.get_values(Product.objects.all()), many=True,
+                                        context=self.context).data
+            return len(context.captured_queries)
+
+        before = count_queries()
+        product_factory.create_batch(5, category=self.category, seller=self.user)
+
+        # page, product categories and one query per level of their subtrees
+        assert count_queries() == before == 5
+
+    def test_list_views_serve_same_payload(self, api_client, tokens):
+        self.user.groups.add(Group.objects.get(name="buyer"))
+        access, _ = tokens(self.user)
+        client = api_client(token=access)
+
+        products = client.get(f"/api/products/categories/{self.category.id}/products/").json()["results"]
+        expected = json.loads(render(ProductSerializer(
+            Product.objects.filter(category=self.category).with_primary_image().with_variant_availability(),
+            many=True, context={"request": Request(APIRequestFactory().get("/"))}
+        )))
+        assert sorted(products, key=itemgetter("id")) == sorted(expected, key=itemgetter("id"))
+
+        categories = client.get("/api/products/categories/", {"search": "Shoes"}).json()["results"]
+        assert {category["name"] for category in categories} == {"Shoes", "Sandals"}
+
+    def test_rejects_input(self):
+        serializer = ProductValuesSerializer(data={"title": "Runner"})
+
+        assert not serializer.is_valid()
+        assert serializer.errors == {"non_field_errors": ["ProductValuesSerializer is read-only."]}
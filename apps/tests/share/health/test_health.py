@@ -0,0 +1,121 @@
+import logging
+import time
+
+import pytest
+from django.db import connection
+from share.services import HealthService
+
+
+def passing(timeout):
+    pass
+
+
+def failing(timeout):
+    raise ConnectionError("Connection refused.")
+
+
+def hanging(timeout):
+    time.sleep(timeout * 5)
+
+
+@pytest.fixture(autouse=True)
+def fresh_report(monkeypatch):
+    monkeypatch.setattr(HealthService, "_report", None)
+    monkeypatch.setattr(HealthService, "_checked_at", 0.0)
+
+
+@pytest.fixture
+def checks(monkeypatch):
+    def set_checks(**checks):
+        monkeypatch.setattr(HealthService, "get_checks", classmethod(lambda cls: checks))
+
+    return set_checks
+
+
+@pytest.mark.parametrize("url", ["/health/", "/health/live", "/health/live/"])
+def test_live(client, url):
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert "no-cache" in response["Cache-Control"]
+
+
+def test_ready(client, checks):
+    checks(database=passing, redis=passing, broker=passing)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert set(response.json()["checks"]) == {"database", "redis", "broker"}
+    assert all(check["status"] == "ok" and check["latency_ms"] >= 0 for check in response.json()["checks"].values())
+
+
+def test_not_ready_when_a_dependency_fails(client, checks, caplog):
+    checks(database=passing, redis=failing)
+
+    with caplog.at_level(logging.ERROR, logger="share.services"):
+        response = client.get("/health/ready/")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "error"
+    assert response.json()["checks"]["database"]["status"] == "ok"
+    assert response.json()["checks"]["redis"]["status"] == "error"
+    assert response.json()["checks"]["redis"]["error"] == "unavailable"
+    assert b"Connection refused" not in response.content
+    assert "Connection refused." in caplog.text
+
+
+def test_slow_dependency_times_out(client, checks, settings):
+    settings.HEALTH_CHECK_TIMEOUT = 0.1
+    checks(database=passing, broker=hanging)
+
+    started = time.perf_counter()
+    response = client.get("/health/ready")
+
+    assert time.perf_counter() - started < 0.4
+    assert response.status_code == 503
+    assert response.json()["checks"]["broker"]["status"] == "timeout"
+    assert response.json()["checks"]["database"]["status"] == "ok"
+
+
+def test_report_is_cached(client, checks, mocker, settings):
+    probe = mocker.Mock()
+    checks(database=probe)
+
+    client.get("/health/ready")
+    client.get("/health/ready")
+    assert probe.call_count == 1
+
+    settings.HEALTH_CHECK_CACHE_TIMEOUT = 0
+    client.get("/health/ready")
+    assert probe.call_count == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_check():
+    assert HealthService.probe(HealthService.check_database, timeout=1)["status"] == "ok"
+
+
+@pytest.mark.parametrize("vendor, options, timeout, expected", [
+    ("postgresql", {"sslmode": "require"}, 0.5,
+     {"sslmode": "require", "connect_timeout": 1, "options": "-c statement_timeout=500"}),
+    ("postgresql", {"options": "-c search_path=shop"}, 2.5,
+     {"connect_timeout": 3, "options": "-c search_path=shop -c statement_timeout=2500"}),
+    ("mysql", {}, 0.5, {"connect_timeout": 1, "read_timeout": 1, "write_timeout": 1}),
+    ("sqlite", {}, 0.5, {"timeout": 0.5}),
+    ("oracle", {"threaded": True}, 0.5, {"threaded": True}),
+])
+def test_database_options_bound_the_check(vendor, options, timeout, expected):
+    assert HealthService.get_database_options(vendor=vendor, options=options, timeout=timeout) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_check_leaves_default_connection_alone():
+    with connection.cursor():
+        pass
+
+    HealthService.check_database(timeout=1)
+
+    assert connection.connection is not None
@@ -0,0 +1,63 @@
+import datetime
+from decimal import Decimal
+from io import BytesIO
+from uuid import UUID
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from share.parsers import ORJSONParser
+from share.renderers import ORJSONRenderer
+
+DATA = {
+    "id": UUID("7ea74921-c7bd-4b28-a21d-ebb094d64068"),
+    "price": Decimal("19.99"),
+    "title": "Juice   box, пример",
+    "tags": ("a", "b"),
+    "date": datetime.date(2024, 10, 1),
+    "nested": [{"count": 1, "ratio": 0.5, "empty": None, "flag": True}],
+    1: "int key",
+}
+
+
+def test_matches_json_renderer_output():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+def test_datetime_uses_configured_format(settings):
+    value = datetime.datetime(2024, 10, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+
+    rendered = ORJSONRenderer().render({"at": value})
+
+    expected = timezone.localtime(value).strftime("%Y-%m-%d %H:%M:%S")
+    assert rendered == f'{{"at":"{expected}"}}'.encode()
+
+
+def test_indent_from_media_type():
+    assert ORJSONRenderer().render({"a": 1}, accepted_media_type="application/json; indent=4") == b'{\n  "a": 1\n}'
+
+
+def test_none_renders_empty_body():
+    assert ORJSONRenderer().render(None) == b""
+
+
+def test_parser_matches_json_parser():
+    body = JSONRenderer().render(DATA)
+
+    assert ORJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"a": NaN}', b"\xff"])
+def test_parser_rejects_invalid_json(body):
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(BytesIO(body))
+
+
+@pytest.mark.django_db
+def test_api_uses_orjson(api_client):
+    response = api_client().post("/api/users/login/", data=b"{", content_type="application/json")
+
+    assert response.status_code == 400
+    assert response.accepted_renderer.__class__ is ORJSONRenderer
@@ -0,0 +1,126 @@
+import re
+from uuid import uuid4
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from share.clients import InstrumentedRedis
+from share.metrics import MetricsRegistry, RequestMetrics, current_metrics
+from user.models import Group
+
+URL = "/api/products/categories/"
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    MetricsRegistry.reset()
+    yield MetricsRegistry
+    MetricsRegistry.reset()
+
+
+def parse_server_timing(header):
+    return {metric.split(";")[0]: metric for metric in header.split(", ")}
+
+
+@pytest.mark.django_db
+class TestInstrumentationMiddleware:
+    @pytest.fixture(autouse=True)
+    def setup(self, api_client, tokens, user_factory, category_factory):
+        user = user_factory(id=uuid4())
+        user.groups.add(Group.objects.get(name="buyer"))
+        self.access, _ = tokens(user)
+        self.client = api_client(token=self.access)
+        category_factory(name="Clothes")
+
+    def test_sampled_request(self, settings):
+        settings.METRICS_SAMPLE_RATE = 1
+
+        response = self.client.get(URL)
+
+        timing = parse_server_timing(response["Server-Timing"])
+        assert response.status_code == 200
+        assert set(timing) == {"total", "db", "redis", "serializer"}
+        assert int(re.search(r'desc="(\d+) queries"', timing["db"]).group(1)) > 0
+        assert int(re.search(r'desc="(\d+) commands"', timing["redis"]).group(1)) > 0
+        assert float(re.search(r"dur=([\d.]+)", timing["serializer"]).group(1)) > 0
+
+    def test_unsampled_request(self, settings):
+        settings.METRICS_SAMPLE_RATE = 0
+
+        response = self.client.get(URL)
+
+        assert set(parse_server_timing(response["Server-Timing"])) == {"total"}
+        assert "http_requests_sampled_total" not in MetricsRegistry.render().split("# TYPE http_requests_sampled")[1]
+
+    def test_asgi(self, settings):
+        settings.METRICS_SAMPLE_RATE = 1
+
+        async def get():
+            return await AsyncClient().get(URL, headers={"Authorization": f"Bearer {self.access}"})
+
+        response = async_to_sync(get)()
+
+        assert response.status_code == 200
+        assert int(re.search(r'desc="(\d+) queries"', response["Server-Timing"]).group(1)) > 0
+
+    def test_disabled(self, settings):
+        settings.METRICS_ENABLED = False
+
+        response = self.client.get(URL)
+
+        assert "Server-Timing" not in response
+        assert MetricsRegistry.render().count("http_requests_total{") == 0
+
+
+@pytest.mark.django_db
+def test_metrics_export(client, settings):
+    settings.METRICS_SAMPLE_RATE = 1
+    settings.METRICS_TOKEN = "secret"
+    client.get("/health/live")
+    client.get("/does-not-exist/")
+
+    response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    body = response.content.decode()
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/health/live/?$",status="200"} 1' in body
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/health/live/?$",le="+Inf"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/health/live/?$"} 1' in body
+    assert 'http_requests_sampled_total{route="/health/live/?$"} 1' in body
+
+
+def test_metrics_token(client, settings):
+    settings.METRICS_TOKEN = "secret"
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+def test_metrics_without_token(client, settings):
+    settings.METRICS_TOKEN = ""
+
+    assert client.get("/metrics").status_code == 404
+
+    settings.METRICS_PUBLIC = True
+    assert client.get("/metrics").status_code == 200
+
+
+def test_redis_commands_are_recorded(mocker):
+    mocker.patch("redis.Redis.execute_command", return_value=True)
+    metrics = RequestMetrics()
+    token = current_metrics.set(metrics)
+    try:
+        InstrumentedRedis().ping()
+        InstrumentedRedis().set("key", "value")
+    finally:
+        current_metrics.reset(token)
+
+    assert metrics.redis_commands == 2
+    assert metrics.redis_time > 0
+
+
+def test_label_escaping():
+    assert MetricsRegistry.format_labels(route='a"b\\c\n') == '{route="a\\"b\\\\c\\n"}'
@@ -0,0 +1,85 @@
+from uuid import uuid4
+
+import pytest
+from django.core.management import call_command
+from drf_spectacular.generators import SchemaGenerator
+from share.services import SchemaCacheService
+
+URL = "/api/schema/"
+
+
+@pytest.fixture(autouse=True)
+def code_version(monkeypatch):
+    version = uuid4().hex
+    monkeypatch.setattr(SchemaCacheService, "_code_version", version)
+    monkeypatch.setattr(SchemaCacheService, "_local", {})
+    return version
+
+
+@pytest.fixture
+def get_schema(mocker):
+    return mocker.spy(SchemaGenerator, "get_schema")
+
+
+@pytest.mark.django_db
+class TestSchemaCache:
+    def test_generated_once(self, api_client, get_schema):
+        client = api_client()
+
+        first = client.get(URL)
+        second = client.get(URL)
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert first["ETag"] == second["ETag"]
+        assert first["Content-Type"].startswith("application/vnd.oai.openapi")
+        assert b"/api/products/{id}/" in first.content
+        assert get_schema.call_count == 1
+
+    def test_if_none_match(self, api_client):
+        client = api_client()
+        etag = client.get(URL)["ETag"]
+
+        response = client.get(URL, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_formats_are_cached_separately(self, api_client):
+        client = api_client()
+
+        yaml = client.get(URL)
+        json = client.get(URL, {"format": "json"})
+
+        assert json.json()["info"]["title"] == "Alibaba Clone API"
+        assert json["ETag"] != yaml["ETag"]
+        assert client.get(URL, {"format": "json"}, HTTP_IF_NONE_MATCH=yaml["ETag"]).status_code == 200
+
+    def test_shared_through_cache(self, api_client, get_schema):
+        client = api_client()
+        client.get(URL)
+        SchemaCacheService._local.clear()
+
+        client.get(URL)
+
+        assert get_schema.call_count == 1
+
+    def test_new_code_version_regenerates(self, api_client, get_schema, monkeypatch):
+        client = api_client()
+        client.get(URL)
+
+        monkeypatch.setattr(SchemaCacheService, "_code_version", uuid4().hex)
+        client.get(URL)
+
+        assert get_schema.call_count == 2
+
+    def test_command_warms_cache(self, api_client, get_schema):
+        call_command("cache_schema")
+        SchemaCacheService._local.clear()
+        generated = get_schema.call_count
+
+        api_client().get(URL)
+        api_client().get(URL, {"format": "json"})
+
+        assert generated == 2
+        assert get_schema.call_count == generated
@@ -0,0 +1,47 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings
+from share import utils
+from share.management.commands.profile_imports import TARGETS
+from share.services import TokenService
+
+DEFERRED_MODULES = ("redis", "PIL", "drf_spectacular.views", "drf_spectacular.generators", "concurrent.futures.process")
+# django.setup() runs in every web and celery process; drf-spectacular is only needed to generate the schema
+SETUP_DEFERRED_MODULES = ("drf_spectacular.extensions", "drf_spectacular.plumbing", "drf_spectacular.openapi")
+
+
+def imported_modules(code):
+    script = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))\n"
+    result = subprocess.run([sys.executable, "-c", script], cwd=settings.BASE_DIR, capture_output=True, text=True,
+                            check=True, env={**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings"})
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_heavy_modules_are_deferred():
+    assert not set(DEFERRED_MODULES) & imported_modules(TARGETS["web"])
+
+
+def test_setup_does_not_load_schema_generation():
+    assert not set(SETUP_DEFERRED_MODULES) & imported_modules("import django; django.setup()")
+
+
+def test_redis_client_is_shared(monkeypatch):
+    monkeypatch.setattr(utils, "_redis_client", None)
+
+    assert TokenService.get_redis_client() is TokenService.get_redis_client() is utils.get_redis()
+    utils.reset_redis()
+    assert utils._redis_client is None
+
+
+@pytest.mark.django_db
+def test_lazy_schema_views(api_client):
+    client = api_client()
+
+    assert client.get("/api/swagger/").status_code == 200
+    assert client.get("/api/redoc/").status_code == 200
+    schema = client.get("/api/schema/?format=json").json()
+    assert schema["components"]["securitySchemes"]["JWTAuthentication"]["scheme"] == "bearer"
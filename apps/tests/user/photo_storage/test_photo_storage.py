@@ -0,0 +1,28 @@
+from uuid import uuid4
+
+import pytest
+from django.core.files.base import ContentFile
+from user.models import Group, BuyerUser
+
+
+@pytest.mark.django_db
+def test_trader_user_photo_blob_is_deferred(user_factory):
+    BuyerUser.objects.create(user=user_factory(id=uuid4()), photo_blob=b"legacy")
+
+    assert BuyerUser.objects.get().get_deferred_fields() == {"photo_blob"}
+
+
+@pytest.mark.django_db
+def test_user_me_returns_photo_url(settings, tmp_path, user_factory, tokens, api_client):
+    settings.MEDIA_ROOT = tmp_path
+    user = user_factory(id=uuid4())
+    user.groups.add(Group.objects.get(name="buyer"))
+    buyer_user = BuyerUser.objects.create(user=user)
+    buyer_user.photo.save("photo.jpg", ContentFile(b"\xff" * 4096))
+    access, _ = tokens(user)
+
+    response = api_client(token=access).get("/api/users/me/")
+
+    assert response.status_code == 200
+    assert response.json()["photo"].endswith(buyer_user.photo.url)
+    assert len(response.content) < 1024
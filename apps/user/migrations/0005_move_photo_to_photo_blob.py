@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_alter_user_user_permissions'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='buyeruser',
+            old_name='photo',
+            new_name='photo_blob',
+        ),
+        migrations.RenameField(
+            model_name='selleruser',
+            old_name='photo',
+            new_name='photo_blob',
+        ),
+        migrations.AddField(
+            model_name='buyeruser',
+            name='photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='users/photos/'),
+        ),
+        migrations.AddField(
+            model_name='selleruser',
+            name='photo',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='users/photos/'),
+        ),
+    ]
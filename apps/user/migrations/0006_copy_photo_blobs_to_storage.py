@@ -0,0 +1,50 @@
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import migrations
+from PIL import Image, UnidentifiedImageError
+
+CHUNK_SIZE = 100
+TRADER_USER_MODELS = "BuyerUser", "SellerUser"
+
+
+def guess_extension(content):
+    try:
+        with Image.open(BytesIO(content)) as image:
+            return f".{image.format.lower()}"
+    except (UnidentifiedImageError, OSError, AttributeError):
+        return ".bin"
+
+
+def blobs_to_storage(apps, schema_editor):
+    for model_name in TRADER_USER_MODELS:
+        model = apps.get_model('user', model_name)
+        # Only the primary keys are listed up front; blobs are fetched CHUNK_SIZE rows at a time.
+        ids = list(model.objects.filter(photo_blob__isnull=False).values_list('id', flat=True))
+        for start in range(0, len(ids), CHUNK_SIZE):
+            rows = model.objects.filter(id__in=ids[start:start + CHUNK_SIZE]).values_list('id', 'photo_blob')
+            for pk, blob in rows.iterator():
+                content = bytes(blob)
+                name = default_storage.save(f"users/photos/{pk}{guess_extension(content)}", ContentFile(content))
+                model.objects.filter(id=pk).update(photo=name, photo_blob=None)
+
+
+def storage_to_blobs(apps, schema_editor):
+    for model_name in TRADER_USER_MODELS:
+        model = apps.get_model('user', model_name)
+        rows = model.objects.exclude(photo__isnull=True).exclude(photo='').values_list('id', 'photo')
+        for pk, name in rows.iterator(chunk_size=CHUNK_SIZE):
+            with default_storage.open(name, 'rb') as file:
+                model.objects.filter(id=pk).update(photo_blob=file.read(), photo=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0005_move_photo_to_photo_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=blobs_to_storage, reverse_code=storage_to_blobs),
+    ]
@@ -2,7 +2,7 @@ from uuid import uuid4
 
 from django.contrib.auth.models import Permission, AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db.models import Model, CharField, BooleanField, ManyToManyField, ForeignKey, DateTimeField, AutoField, \
-    UUIDField, CASCADE, BinaryField, DateField, EmailField, OneToOneField
+    UUIDField, CASCADE, BinaryField, DateField, EmailField, OneToOneField, ImageField, Manager
 
 
 # Create your models here.
@@ -111,7 +111,16 @@ class Group(Model):
         return str(self.name)
 
 
+class TraderUserManager(Manager):
+    """ Never load the legacy photo blob unless it is asked for explicitly. """
+
+    def get_queryset(self):
+        return super().get_queryset().defer("photo_blob")
+
+
 class SellerUser(Model):
+    objects: TraderUserManager = TraderUserManager()
+
     class Meta:
         db_table: str = "seller"
         verbose_name: str = "Seller users"
@@ -120,7 +129,8 @@ class SellerUser(Model):
     id = UUIDField(primary_key=True, default=uuid4)
     user = ForeignKey(to=User, on_delete=CASCADE)
     company = CharField(max_length=50, null=True)
-    photo = BinaryField(null=True)
+    photo = ImageField(upload_to="users/photos/", max_length=255, null=True, blank=True)
+    photo_blob = BinaryField(null=True)
     bio = CharField(max_length=255, null=True)
     birth_date = DateField(null=True)
     country = CharField(max_length=50, null=True)
@@ -137,6 +147,8 @@ class SellerUser(Model):
 
 
 class BuyerUser(Model):
+    objects: TraderUserManager = TraderUserManager()
+
     class Meta:
         db_table: str = "buyer"
         verbose_name: str = "Buyer user"
@@ -145,7 +157,8 @@ class BuyerUser(Model):
 
     id: UUIDField = UUIDField(primary_key=True, default=uuid4)
     user: ForeignKey = ForeignKey(to=User, on_delete=CASCADE)
-    photo: BinaryField = BinaryField(null=True)
+    photo: ImageField = ImageField(upload_to="users/photos/", max_length=255, null=True, blank=True)
+    photo_blob: BinaryField = BinaryField(null=True)
     bio: CharField = CharField(max_length=255, null=True)
     birth_date = DateField(null=True)
     country = CharField(max_length=50, null=True)
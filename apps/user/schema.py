@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING, Any, Type
+
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+from .backends import CustomJWTAuthentication
+
+if TYPE_CHECKING:
+    from drf_spectacular.openapi import AutoSchema
+
+
+class MyAuthenticationScheme(OpenApiAuthenticationExtension):
+    target_class: Type[CustomJWTAuthentication] = CustomJWTAuthentication
+    name: str = "JWTAuthentication"
+
+    def get_security_definition(self, auto_schema: "AutoSchema") -> dict[str, str]:
+        return {
+            "type": "http",
+            "scheme": "bearer",
+            "bearerFormat": "JWT",
+            "description": "Value should be formatted as: `Bearer ${access_token}`",
+        }
+
+
+def load_extensions(endpoints: list[tuple[Any, ...]], **kwargs) -> list[tuple[Any, ...]]:
+    """
+    Preprocessing hook (SPECTACULAR_SETTINGS) that registers the extensions above by importing this module,
+    so drf-spectacular is only loaded when a schema is generated instead of in every process at startup.
+    """
+    return endpoints
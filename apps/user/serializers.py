@@ -1,10 +1,8 @@
 import re
 from typing import TYPE_CHECKING, Type, Any, Literal
 
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from redis import Redis
 from rest_framework.exceptions import NotFound
 from rest_framework.serializers import ModelSerializer, ChoiceField, ValidationError, CharField, Serializer, \
     SerializerMethodField, EmailField
@@ -17,8 +15,6 @@ if TYPE_CHECKING:
 
 UserModel: "Type[AbstractBaseUser]" = get_user_model()
 
-redis_conn: Redis = Redis.from_url(settings.REDIS_URL)
-
 
 class UserSerializer(ModelSerializer):
     confirm_password = CharField(write_only=True)
@@ -197,11 +193,11 @@ class UsersMeSerializer(ModelSerializer):
     def get_trader_user(self, instance: UserModel) -> dict[str, Any | None] | None:
         buyer_user: BuyerUser = BuyerUser.objects.filter(user=instance).first()
         if buyer_user is not None:
-            return BuyerUserSerializer(instance=buyer_user).data
+            return BuyerUserSerializer(instance=buyer_user, context=self.context).data
 
         seller_user: SellerUser = SellerUser.objects.filter(user=instance).first()
         if seller_user is not None:
-            return SellerUserSerializer(instance=seller_user).data
+            return SellerUserSerializer(instance=seller_user, context=self.context).data
 
         return None
 
@@ -1,13 +1,10 @@
 from secrets import token_urlsafe
 from typing import TYPE_CHECKING, Type, Any, Literal
 
-from django.conf import settings
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.hashers import make_password
 from django.utils.translation import gettext_lazy as _
-from drf_spectacular.openapi import OpenApiAuthenticationExtension
 from drf_spectacular.utils import extend_schema_view, extend_schema
-from redis import Redis
 from rest_framework.generics import GenericAPIView, RetrieveAPIView, UpdateAPIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
@@ -18,7 +15,6 @@ from share.permissions import GeneratePermissions
 from share.utils import generate_otp, redis_conn, check_otp
 
 from apps.share.exceptions import OTPException
-from .backends import CustomJWTAuthentication
 from .models import BuyerUser, SellerUser
 from .models import User
 from .serializers import UserSerializer, VerifyCodeSerializer, LoginSerializer, UsersMeSerializer, BuyerUserSerializer, \
@@ -31,26 +27,9 @@ if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser
     from rest_framework.request import Request
     from django.db.models import QuerySet
-    from drf_spectacular.openapi import AutoSchema
-
-
-class MyAuthenticationScheme(OpenApiAuthenticationExtension):
-    target_class: Type[CustomJWTAuthentication] = CustomJWTAuthentication
-    name: str = "JWTAuthentication"
-
-    def get_security_definition(self, auto_schema: "AutoSchema") -> dict[str, str]:
-        return {
-            "type": "http",
-            "scheme": "bearer",
-            "bearerFormat": "JWT",
-            "description": "Value should be formatted as: `Bearer ${access_token}`",
-        }
-
 
 UserModel: "Type[AbstractBaseUser]" = User
 
-redis_conn: Redis = Redis.from_url(settings.REDIS_URL)
-
 
 # Create your views here.
 
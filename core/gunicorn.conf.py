@@ -0,0 +1,20 @@
+"""
+Gunicorn settings, see .deploy/entrypoint.sh. The app is imported once in the master and the workers are
+forked from it, so they start without repeating Django's setup and share the imported code pages.
+"""
+bind: str = "0.0.0.0:8000"
+preload_app: bool = True
+
+
+def when_ready(server) -> None:
+    # Resolve the URLconf once in the master instead of on the first request of every worker
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+
+
+def pre_fork(server, worker) -> None:
+    # Connections opened while loading must not be shared between the forked workers
+    from django.db import connections
+
+    connections.close_all()
@@ -45,6 +45,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + EXTERNAL_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "share.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -122,6 +123,18 @@ STATIC_ROOT: Path = BASE_DIR / "static"
 MEDIA_URL: str = '/media/'
 MEDIA_ROOT: Path = BASE_DIR / "media"
 
+# product image variants (widths in pixels, WebP quality)
+
+PRODUCT_IMAGE_VARIANT_WIDTHS: tuple[int, ...] = 160, 320, 640, 1024
+PRODUCT_IMAGE_VARIANT_QUALITY: int = 80
+
+# product facets (price bucket bounds, index cache lifetime in seconds, indexes kept per process and for how long)
+
+PRODUCT_PRICE_BUCKETS: tuple[int, ...] = 0, 50, 100, 500, 1000
+PRODUCT_FACET_INDEX_TIMEOUT: int = 60 * 60
+PRODUCT_FACET_LOCAL_INDEXES: int = 64
+PRODUCT_FACET_LOCAL_TIMEOUT: int = 60
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD: str = "django.db.models.BigAutoField"
 
@@ -156,7 +169,8 @@ CACHES: dict[str, dict[str, str | dict[str, str]]] = {
         "BACKEND": "django_redis.cache.RedisCache",
         "LOCATION": REDIS_URL,
         "OPTIONS": {
-            "CLIENT_CLASS": "django_redis.client.DefaultClient"
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "REDIS_CLIENT_CLASS": "share.clients.InstrumentedRedis",
         }
     }
 }
@@ -164,6 +178,10 @@ CACHES: dict[str, dict[str, str | dict[str, str]]] = {
 SESSION_ENGINE: str = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS: str = "default"
 
+# cached detail responses (share.mixins.CachedRetrieveMixin); the timeout bounds staleness of data
+# that is not invalidated explicitly, e.g. the seller block of a product
+RESPONSE_CACHE_TIMEOUT: int = 60 * 10
+
 # celery setup
 CELERY_BROKER_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
@@ -173,6 +191,18 @@ CELERY_TIMEZONE: str = TIME_ZONE
 
 CELERY_TASKS_ALWAYS_EAGER: bool = False
 
+# health checks (share.services.HealthService); seconds
+HEALTH_CHECK_TIMEOUT: float = config("HEALTH_CHECK_TIMEOUT", default=1.0, cast=float)
+HEALTH_CHECK_CACHE_TIMEOUT: float = 1.0
+
+# request instrumentation (share.middleware.InstrumentationMiddleware); the database/Redis/serializer
+# breakdown is recorded for METRICS_SAMPLE_RATE of the requests; /metrics requires METRICS_TOKEN and is not
+# served without one, unless METRICS_PUBLIC opts in to exposing it unauthenticated
+METRICS_ENABLED: bool = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_SAMPLE_RATE: float = config("METRICS_SAMPLE_RATE", default=0.05, cast=float)
+METRICS_TOKEN: str = config("METRICS_TOKEN", default="", cast=str)
+METRICS_PUBLIC: bool = config("METRICS_PUBLIC", default=False, cast=bool)
+
 # stripe setup
 
 
@@ -188,6 +218,15 @@ REST_FRAMEWORK: dict[str, list[str] | str | int] = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'share.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'share.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
@@ -229,12 +268,18 @@ SIMPLE_JWT: dict[str, timedelta | bool | str | None | tuple[str]] = {
 
 # DRF Spectacular
 
+# the generated OpenAPI schema is cached under the code version (share.services.SchemaCacheService);
+# deploys should set CODE_VERSION (e.g. the git commit), otherwise the sources are hashed on first use
+CODE_VERSION: str = config("CODE_VERSION", default="", cast=str)
+SCHEMA_CACHE_TIMEOUT: int = 60 * 60 * 24 * 7
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Alibaba Clone API",
     "DESCRIPTION": "API documentation for Alibaba Clone Backend",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
     "SORT_OPERATIONS": False,
+    "PREPROCESSING_HOOKS": ["user.schema.load_extensions"],
     "TAGS": [
         {
             "name": "Users and Auth Management API",
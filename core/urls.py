@@ -18,25 +18,32 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.http import JsonResponse
-from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from django.urls import path, include, re_path
+from share import health, metrics
+from share.utils import lazy_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", lambda request: JsonResponse(data={'detail': 'Healthy'}), name='health'),
+    path("health/", include([
+        path("", health.live),
+        re_path(r"^live/?$", health.live, name="health-live"),
+        re_path(r"^ready/?$", health.ready, name="health-ready"),
+    ])),
+    re_path(r"^metrics/?$", metrics.export, name="metrics"),
     path("api/", include([
         path("users/", include("user.urls")),
         path("products/", include("product.urls")),
         path("schema/",
-             SpectacularAPIView.as_view(),
+             lazy_view("share.views.CachedSpectacularAPIView"),
              name="schema"
              ),
         path("swagger/",
-             SpectacularSwaggerView.as_view(url_name="schema"),
+             lazy_view("drf_spectacular.views.SpectacularSwaggerView", url_name="schema"),
              name="swagger-ui"
              ),
         path("redoc/",
-             SpectacularRedocView.as_view(url_name="schema"),
+             lazy_view("drf_spectacular.views.SpectacularRedocView", url_name="schema"),
              name="redoc"
              )
     ]